@@ -0,0 +1,38 @@
+"""Add trigram indexes for catalog keyword search
+
+Revision ID: 004_add_catalog_trgm_indexes
+Revises: 003_add_conversations_messages
+Create Date: 2026-10-15
+
+Keyword search matches '%query%' against title, author, subject and abstract.
+Only title had a trigram index, so every other field fell back to a
+sequential scan. GIN trigram indexes act as an inverted index for
+ILIKE substring matches.
+"""
+
+from alembic import op
+
+revision = "004_add_catalog_trgm_indexes"
+down_revision = "003_add_conversations_messages"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = ("author", "subject", "abstract")
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in _COLUMNS:
+        op.create_index(
+            f"catalog_{column}_trgm_idx",
+            "catalog",
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for column in _COLUMNS:
+        op.drop_index(f"catalog_{column}_trgm_idx", table_name="catalog")
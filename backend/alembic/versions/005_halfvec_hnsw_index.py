@@ -0,0 +1,38 @@
+"""Rebuild the embedding HNSW index over half-precision vectors
+
+Revision ID: 005_halfvec_hnsw_index
+Revises: 004_add_catalog_trgm_indexes
+Create Date: 2026-10-15
+
+Indexing embedding::halfvec halves the index size (2 bytes per dimension
+instead of 4), so more of the graph stays in shared buffers and each distance
+computation reads half the memory. The column itself stays float32. Requires
+pgvector >= 0.7.
+"""
+
+from alembic import op
+
+revision = "005_halfvec_hnsw_index"
+down_revision = "004_add_catalog_trgm_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS catalog_embedding_halfvec_hnsw_idx
+        ON catalog
+        USING hnsw ((embedding::halfvec(1024)) halfvec_cosine_ops)
+        WITH (m = 24, ef_construction = 128)
+    """)
+    op.execute("DROP INDEX IF EXISTS catalog_embedding_hnsw_idx")
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS catalog_embedding_hnsw_idx
+        ON catalog
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 24, ef_construction = 128)
+    """)
+    op.execute("DROP INDEX IF EXISTS catalog_embedding_halfvec_hnsw_idx")
@@ -2,16 +2,21 @@
 Chat API routes for AI-powered paper Q&A.
 """
 
+import asyncio
 import logging
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 
-from app.core.models import ChatRequest, ChatResponse, CitationAudit
+from app.core.models import CITED_PAPERS_ADAPTER, ChatRequest, ChatResponse, CitationAudit
 from app.services.rag import get_rag_service
 from app.core.auth import get_current_user_required
 from app.services.session_manager import get_session_manager
-from app.utils.streaming import _audit_citations, stream_dspy_response
+from app.utils.streaming import (
+    _audit_citations,
+    bounded_sse_stream,
+    stream_dspy_response,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/chat", tags=["chat"])
@@ -115,7 +120,7 @@ async def chat_basic(
                 conversation_id=conversation_id,
                 question=query,
                 answer=result["answer"],
-                sources=[s.model_dump() if hasattr(s, "model_dump") else s for s in result.get("sources", [])],
+                sources=CITED_PAPERS_ADAPTER.dump_python(result.get("sources", []), mode="json"),
                 search_query=result.get("search_query"),
                 is_incognito=meta_params.is_incognito,
                 user_id=user_id,
@@ -144,27 +149,35 @@ async def chat_basic(
     # ------------------------------------------------------------------ #
     # Streaming path                                                       #
     # ------------------------------------------------------------------ #
+    # The stream runs history saving and title generation concurrently; the
+    # title is only saved once the turn (and thus the conversation row) exists
+    history_saved = asyncio.Event()
+
     async def _on_complete(answer: str, sources: list, search_query: str | None) -> None:
-        if conversation_id:
-            await _save_history(
-                conversation_id=conversation_id,
-                question=query,
-                answer=answer,
-                sources=sources,
-                search_query=search_query,
-                is_incognito=meta_params.is_incognito,
-                user_id=user_id,
-            )
+        try:
+            if conversation_id:
+                await _save_history(
+                    conversation_id=conversation_id,
+                    question=query,
+                    answer=answer,
+                    sources=sources,
+                    search_query=search_query,
+                    is_incognito=meta_params.is_incognito,
+                    user_id=user_id,
+                )
+        finally:
+            history_saved.set()
 
     # Only generate+emit title on the first message of a non-incognito conversation
     async def _title_generator(question: str, answer: str) -> str:
         title = await rag_service.generate_title(question, answer)
         if conversation_id and not meta_params.is_incognito:
+            await history_saved.wait()
             await _save_title(conversation_id, title, user_id)
         return title
 
     return StreamingResponse(
-        stream_dspy_response(
+        bounded_sse_stream(stream_dspy_response(
             rag_service.get_module(),
             rag_service.get_retriever(),
             question=query,
@@ -180,7 +193,9 @@ async def chat_basic(
             generate_title=_title_generator if is_first_message and not meta_params.is_incognito else None,
             query_reformulator=rag_service.query_reformulator,
             gap_detector=rag_service.gap_detector,
-        ),
+            intent_query_classifier=rag_service.intent_query_classifier,
+            include_final_answer=meta_params.include_final_answer,
+        )),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -2,8 +2,9 @@
 Health check and API info routes.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from datetime import datetime
+from functools import lru_cache
 from app.config import get_settings
 from app.core.models import HealthResponse, APIInfo
 
@@ -30,6 +31,15 @@ async def health_check():
     )
 
 
+@router.head("/health", include_in_schema=False)
+async def health_check_head():
+    """
+    Status-only health probe: 200 with an empty body, for clients that
+    just need to know the server is up.
+    """
+    return Response()
+
+
 @router.get("/", response_model=APIInfo)
 async def api_info():
     """
@@ -40,6 +50,12 @@ async def api_info():
     curl http://localhost:8000/
     ```
     """
+    return Response(content=_api_info_json(), media_type="application/json")
+
+
+@lru_cache(maxsize=1)
+def _api_info_json() -> bytes:
+    """The info payload is static for the process lifetime, so serialize it once."""
     settings = get_settings()
     
     return APIInfo(
@@ -54,4 +70,4 @@ async def api_info():
             "POST /chat/basic": "AI chat with papers (streaming)",
             "POST /chat/deep": "Deep research with RLM (not implemented)"
         }
-    )
+    ).model_dump_json().encode()
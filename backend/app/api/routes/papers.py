@@ -2,8 +2,11 @@
 Paper search and listing API routes.
 """
 
-from fastapi import APIRouter, Query
-from typing import List
+import time
+
+from fastapi import APIRouter, Query, Response
+from pydantic import TypeAdapter
+from typing import List, Optional, Tuple
 from app.core.models import (
     SearchRequest, 
     SearchResponse, 
@@ -14,6 +17,12 @@ from app.services.rag import get_rag_service
 
 router = APIRouter(prefix="/papers", tags=["papers"])
 
+# The catalog changes rarely, so /list serves pre-serialized JSON for a short
+# while instead of querying and re-serializing on every call.
+_PAPER_LIST_TA = TypeAdapter(List[Paper])
+_PAPER_LIST_TTL = 60.0  # seconds
+_paper_list_cache: Optional[Tuple[float, bytes]] = None
+
 
 @router.get("/search", response_model=SearchResponse)
 async def search_papers_get(
@@ -76,10 +85,15 @@ async def list_all_papers():
     curl http://localhost:8000/papers/list
     ```
     """
-    rag_service = get_rag_service()
-    retriever = rag_service.get_retriever()
+    global _paper_list_cache
+    now = time.monotonic()
+    if _paper_list_cache is None or now - _paper_list_cache[0] > _PAPER_LIST_TTL:
+        rag_service = get_rag_service()
+        retriever = rag_service.get_retriever()
+        papers = await retriever.get_all_papers()
+        _paper_list_cache = (now, _PAPER_LIST_TA.dump_json(papers))
     
-    return await retriever.get_all_papers()
+    return Response(content=_paper_list_cache[1], media_type="application/json")
 
 
 @router.get("/list", response_model=List[Paper])
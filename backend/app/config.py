@@ -49,11 +49,16 @@ class Settings(BaseSettings):
     # - "openrouter/nvidia/llama-3.1-nemotron-70b-instruct:free" (free tier)
     
     DSPY_MAX_WORKERS: int = 4
+    DSPY_POOL_SIZE: int = 16  # Threads for blocking DSPy calls in streaming
+    SSE_QUEUE_SIZE: int = 64  # SSE frames buffered per stream before backpressure
     
     # Retrieval Configuration
     RETRIEVAL_TOP_K: int = 3
     EMBEDDING_MODEL: str = "voyage-4-lite"
     EMBEDDING_DIM: int = 1024
+    HYBRID_SEARCH: bool = False  # Fuse keyword and vector results with RRF
+    PROXIMITY_CACHE_SIZE: int = 256  # Recent vector searches kept in memory (0 disables)
+    PROXIMITY_CACHE_THRESHOLD: float = 0.97  # Cosine similarity needed to reuse one
     
     # Application Configuration
     APP_NAME: str = "Telkom Paper Research API"
@@ -26,3 +26,8 @@ class LLMError(PaperResearchException):
 class StreamingError(PaperResearchException):
     """Raised when streaming fails."""
     pass
+
+
+class ClientTooSlow(StreamingError):
+    """Raised when an SSE client stops draining events for too long."""
+    pass
@@ -2,7 +2,7 @@
 Core Pydantic models for request/response schemas and data models.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional
 from datetime import datetime
 
@@ -105,6 +105,10 @@ class ChatMetaParams(BaseModel):
         default=None,
         description="Conversation ID for retrieving history"
     )
+    include_final_answer: bool = Field(
+        default=True,
+        description="If false, the streaming 'done' event omits the answer already sent as tokens"
+    )
 
 
 
@@ -166,6 +170,10 @@ class CitedPaper(BaseModel):
     citation_number: int = Field(..., description="Inline citation number used in answer, e.g. [1]")
 
 
+# Validates/serializes whole source lists in pydantic-core rather than per item
+CITED_PAPERS_ADAPTER = TypeAdapter(List[CitedPaper])
+
+
 class CitationAudit(BaseModel):
     """Result of checking inline [N] citations against retrieved papers."""
     is_clean: bool = Field(..., description="True when all [N] citations are within range")
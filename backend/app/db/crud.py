@@ -3,16 +3,36 @@ CRUD operations for Catalog model.
 """
 
 import logging
+import re
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_, and_, text, case
+from sqlalchemy import select, func, or_, and_, text, case, cast
 from sqlalchemy.orm import selectinload
+from pgvector.sqlalchemy import HALFVEC
 
 from app.db.models import Catalog, CatalogType, Conversation, Message
 from app.db.schemas import CatalogCreate, CatalogUpdate, CatalogFilterRequest
 
 logger = logging.getLogger(__name__)
 
+# The HNSW index is built over embedding::halfvec (migration 005); queries must
+# use the same cast for the planner to pick it
+_HALFVEC = HALFVEC(Catalog.embedding.type.dim)
+
+# Words shorter than this match almost every row and only widen the scan
+_MIN_TERM_LEN = 3
+_MAX_TERMS = 8
+# Letters/digits only, so terms never carry LIKE wildcards (% or _)
+_TERM_RE = re.compile(r"[^\W_]+")
+
+
+def _keyword_terms(query: str) -> List[str]:
+    """Distinct lowercase words of `query` worth matching on, in order."""
+    terms = dict.fromkeys(
+        word for word in _TERM_RE.findall(query.lower()) if len(word) >= _MIN_TERM_LEN
+    )
+    return list(terms)[:_MAX_TERMS]
+
 
 class CatalogCRUD:
     """CRUD operations for catalog items."""
@@ -136,7 +156,8 @@ class CatalogCRUD:
         """
         await self.session.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
 
-        score_expr = (1 - Catalog.embedding.cosine_distance(embedding)).label("score")
+        distance = cast(Catalog.embedding, _HALFVEC).cosine_distance(cast(embedding, _HALFVEC))
+        score_expr = (1 - distance).label("score")
 
         query = select(Catalog, score_expr)
         
@@ -159,7 +180,7 @@ class CatalogCRUD:
             query = query.where(and_(*filters))
             
         # Order by distance (ascending) and limit
-        query = query.order_by(Catalog.embedding.cosine_distance(embedding)).limit(limit)
+        query = query.order_by(distance).limit(limit)
         
         logger.info(f"[CRUD] Vector search limit={limit}")
         result = await self.session.execute(query)
@@ -186,7 +207,8 @@ class CatalogCRUD:
         
         # Build search conditions
         search_conditions = []
-        query_lower = f"%{query.lower()}%"
+        # ILIKE (not lower(col) LIKE) so the pg_trgm GIN indexes can serve the match
+        pattern = f"%{query}%"
         
         field_mapping = {
             "title": Catalog.title,
@@ -200,7 +222,7 @@ class CatalogCRUD:
         for field in search_fields:
             if field in field_mapping:
                 search_conditions.append(
-                    func.lower(field_mapping[field]).like(query_lower)
+                    field_mapping[field].ilike(pattern)
                 )
         
         logger.info(f"[CRUD] Search params: query='{query}', fields={search_fields}, limit={limit}")
@@ -233,13 +255,13 @@ class CatalogCRUD:
         
         # Relevance score
         score_expr = func.coalesce(
-            case((func.lower(Catalog.title).like(query_lower), 3.0), else_=0.0), 0.0
+            case((Catalog.title.ilike(pattern), 3.0), else_=0.0), 0.0
         ) + func.coalesce(
-            case((func.lower(Catalog.author).like(query_lower), 2.0), else_=0.0), 0.0
+            case((Catalog.author.ilike(pattern), 2.0), else_=0.0), 0.0
         ) + func.coalesce(
-            case((func.lower(Catalog.abstract).like(query_lower), 1.5), else_=0.0), 0.0
+            case((Catalog.abstract.ilike(pattern), 1.5), else_=0.0), 0.0
         ) + func.coalesce(
-            case((func.lower(Catalog.subject).like(query_lower), 1.0), else_=0.0), 0.0
+            case((Catalog.subject.ilike(pattern), 1.0), else_=0.0), 0.0
         )
         
         # Final query
@@ -252,6 +274,52 @@ class CatalogCRUD:
         
         return [(row[0], float(row[1])) for row in rows], total
     
+    async def keyword_candidates(
+        self,
+        query: str,
+        catalog_type: Optional[str] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        limit: int = 20,
+    ) -> List[tuple[Catalog, float]]:
+        """
+        Rank catalogs by how many query words they contain, for hybrid fusion.
+        Unlike search(), each word is matched on its own (OR'd), so a natural
+        language question still finds papers sharing only some of its words,
+        and no total count is computed.
+        """
+        terms = _keyword_terms(query)
+        if not terms:
+            return []
+
+        columns = (
+            (Catalog.title, 3.0),
+            (Catalog.author, 2.0),
+            (Catalog.abstract, 1.5),
+            (Catalog.subject, 1.0),
+        )
+        conditions = []
+        score_expr = 0.0
+        for term in terms:
+            pattern = f"%{term}%"
+            for column, weight in columns:
+                conditions.append(column.ilike(pattern))
+                score_expr = score_expr + func.coalesce(
+                    case((column.ilike(pattern), weight), else_=0.0), 0.0
+                )
+
+        stmt = select(Catalog, score_expr.label("score")).where(or_(*conditions))
+        if catalog_type:
+            stmt = stmt.where(Catalog.catalog_type == catalog_type)
+        if year_from is not None:
+            stmt = stmt.where(Catalog.publication_year >= year_from)
+        if year_to is not None:
+            stmt = stmt.where(Catalog.publication_year <= year_to)
+        stmt = stmt.order_by(score_expr.desc(), Catalog.id.desc()).limit(limit)
+
+        result = await self.session.execute(stmt)
+        return [(row[0], float(row[1])) for row in result.all()]
+
     async def filter_catalogs(
         self,
         filters: CatalogFilterRequest
@@ -274,12 +342,12 @@ class CatalogCRUD:
         
         if filters.author:
             conditions.append(
-                func.lower(Catalog.author).like(f"%{filters.author.lower()}%")
+                Catalog.author.ilike(f"%{filters.author}%")
             )
         
         if filters.subject:
             conditions.append(
-                func.lower(Catalog.subject).like(f"%{filters.subject.lower()}%")
+                Catalog.subject.ilike(f"%{filters.subject}%")
             )
         
         if filters.library_location:
@@ -16,6 +16,7 @@ from app.database import get_session_factory, close_db
 from app.api.routes import chat, papers, health
 from app.services.rag import init_rag_service
 from app.services.retriever import PaperRetriever
+from app.utils.dspy_executor import shutdown_dspy_pool
 from app.utils.logging_config import setup_logging
 
 
@@ -90,6 +91,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down...")
+    shutdown_dspy_pool()
     try:
         await close_db()
         logger.info("Database connections closed")
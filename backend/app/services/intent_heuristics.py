@@ -0,0 +1,38 @@
+"""
+Cheap regex/keyword checks that settle a question's intent without an LM call.
+"""
+
+import re
+
+_STRIP_TABLE = str.maketrans("", "", "?,.:")
+
+_RESEARCH_MARKERS = frozenset({
+    "paper", "papers", "study", "studies", "arxiv", "doi",
+    "citation", "citations", "authors", "abstract", "preprint",
+})
+
+
+def is_obviously_research(question: str) -> bool:
+    """
+    Heuristic: questions that mention papers/studies/citations are research
+    questions, so the intent classifier LLM call can be skipped.
+    """
+    return not _RESEARCH_MARKERS.isdisjoint(
+        w.lower().translate(_STRIP_TABLE) for w in question.split()
+    )
+
+
+_CHITCHAT_RE = re.compile(
+    r"^\W*(?:hi|hello|hey|halo|hai|thanks|thank you|terima kasih|makasih|"
+    r"good (?:morning|afternoon|evening)|selamat (?:pagi|siang|sore|malam))"
+    r"(?:\s+(?:there|all|everyone|semua|kak))?\W*$",
+    re.IGNORECASE,
+)
+
+
+def is_obviously_chitchat(question: str) -> bool:
+    """
+    Heuristic: bare greetings and thanks are general questions, so intent
+    classification, query generation and retrieval can all be skipped.
+    """
+    return _CHITCHAT_RE.match(question) is not None
@@ -2,14 +2,16 @@
 RAG (Retrieval-Augmented Generation) service using DSPy.
 """
 
-import asyncio
-import contextlib
 import logging
 import dspy
-from typing import List, Optional
+from typing import List, Literal, Optional
 from app.services.retriever import PaperRetriever
 from app.services.planner import ResearchPlanner
-from app.core.models import CitedPaper
+from app.core.models import CITED_PAPERS_ADAPTER
+from app.utils.answer_cache import cache_chat, chat_cache_key, get_cached_chat
+from app.utils.dspy_executor import EMPTY_HISTORY, run_dspy_async
+from app.services.intent_heuristics import is_obviously_chitchat
+from app.utils.streaming import build_cited_papers
 
 logger = logging.getLogger(__name__)
 
@@ -125,6 +127,22 @@ class IntentClassificationSignature(dspy.Signature):
     explanation: str = dspy.OutputField(desc="Brief reasoning for the chosen category")
 
 
+class IntentQuerySignature(dspy.Signature):
+    """
+    Categorize user input and, in the same pass, extract search keywords for it.
+
+    Categories:
+    - 'research': Specific questions about papers, topics, authors, or research areas.
+    - 'general': Greetings, identity ('who are you?'), general AI talk, or simple conversation.
+
+    The search query should contain the core concepts and technical keywords that
+    would appear in paper titles and abstracts.
+    """
+    question: str = dspy.InputField()
+    category: Literal["research", "general"] = dspy.OutputField()
+    search_query: str = dspy.OutputField(desc="Optimized search keywords (3-5 key terms) for database lookup")
+
+
 class GapDetectionSignature(dspy.Signature):
     """
     Determine if a generated answer fully covers all aspects of the user's question.
@@ -173,6 +191,22 @@ class IntentClassifier(dspy.Module):
     def forward(self, question: str) -> dspy.Prediction:
         return self.classify(question=question)
 
+    async def aforward(self, question: str) -> dspy.Prediction:
+        return await self.classify.acall(question=question)
+
+
+class IntentQueryClassifier(dspy.Module):
+    """Classifies intent and generates the search query with a single LM call."""
+    def __init__(self):
+        super().__init__()
+        self.classify = dspy.Predict(IntentQuerySignature)
+
+    def forward(self, question: str) -> dspy.Prediction:
+        return self.classify(question=question)
+
+    async def aforward(self, question: str) -> dspy.Prediction:
+        return await self.classify.acall(question=question)
+
 
 class AcknowledgmentGenerator(dspy.Module):
     """Generates a brief acknowledgment before research begins."""
@@ -183,6 +217,9 @@ class AcknowledgmentGenerator(dspy.Module):
     def forward(self, question: str) -> dspy.Prediction:
         return self.generate(question=question)
 
+    async def aforward(self, question: str) -> dspy.Prediction:
+        return await self.generate.acall(question=question)
+
 
 class QueryGenerator(dspy.Module):
     """
@@ -212,6 +249,13 @@ class QueryGenerator(dspy.Module):
             rationale=getattr(result, 'rationale', None)
         )
 
+    async def aforward(self, user_question: str) -> dspy.Prediction:
+        result = await self.generate.acall(user_question=user_question)
+        return dspy.Prediction(
+            search_query=result.search_query,
+            rationale=getattr(result, 'rationale', None)
+        )
+
 
 class QueryReformulator(dspy.Module):
     """Generates a broader query when the first search returns no results."""
@@ -224,6 +268,10 @@ class QueryReformulator(dspy.Module):
         result = self.reformulate(original_query=original_query)
         return dspy.Prediction(broader_query=result.broader_query)
 
+    async def aforward(self, original_query: str) -> dspy.Prediction:
+        result = await self.reformulate.acall(original_query=original_query)
+        return dspy.Prediction(broader_query=result.broader_query)
+
 
 class GapDetector(dspy.Module):
     """Detects missing aspects in a generated answer and returns a gap-filling search query."""
@@ -235,6 +283,9 @@ class GapDetector(dspy.Module):
     def forward(self, question: str, answer: str) -> dspy.Prediction:
         return self.detect(question=question, answer=answer)
 
+    async def aforward(self, question: str, answer: str) -> dspy.Prediction:
+        return await self.detect.acall(question=question, answer=answer)
+
 
 class PaperRAG(dspy.Module):
     """
@@ -271,7 +322,7 @@ class PaperRAG(dspy.Module):
         """
         # Use empty history if none provided
         if history is None:
-            history = dspy.History(messages=[])
+            history = EMPTY_HISTORY
         
         # Generate answer with reasoning and history context
         result = self.generate(
@@ -286,6 +337,19 @@ class PaperRAG(dspy.Module):
             rationale=getattr(result, 'rationale', None)
         )
 
+    async def aforward(self, question: str, context: str, history: Optional[dspy.History] = None) -> dspy.Prediction:
+        """Async counterpart of forward(); awaits the LM natively instead of blocking a thread."""
+        result = await self.generate.acall(
+            question=question,
+            context=context,
+            history=history if history is not None else EMPTY_HISTORY
+        )
+        return dspy.Prediction(
+            answer=result.answer,
+            sources=result.sources,
+            rationale=getattr(result, 'rationale', None)
+        )
+
 
 class RAGService:
     """
@@ -308,12 +372,13 @@ class RAGService:
         self.query_generator = QueryGenerator()
         self.query_reformulator = QueryReformulator()
         self.intent_classifier = IntentClassifier()
+        self.intent_query_classifier = IntentQueryClassifier()
         self.acknowledgment_generator = AcknowledgmentGenerator()
         self.planner = ResearchPlanner()
         self.gap_detector = GapDetector()
         self.cheap_lm = cheap_lm
     
-    def _generate_search_query(self, user_question: str) -> str:
+    async def _generate_search_query(self, user_question: str) -> str:
         """
         Use LLM to generate optimized search keywords.
         Uses cheap model if available to save costs.
@@ -326,49 +391,16 @@ class RAGService:
         """
         logger.info(f"[RAG] Generating search query from: '{user_question}'")
         
-        if self.cheap_lm:
-            # Use cheap model for query generation
-            logger.debug("[RAG] Using cheap model for query generation")
-            with dspy.context(lm=self.cheap_lm):
-                result = self.query_generator(user_question=user_question)
-        else:
-            # Fallback to default model
-            result = self.query_generator(user_question=user_question)
+        # Uses the cheap model when configured, else the default model
+        result = await run_dspy_async(
+            self.query_generator, cheap_lm=self.cheap_lm, user_question=user_question
+        )
         
         search_query = result.search_query
         logger.info(f"[RAG] Generated search query: '{search_query}'")
         logger.debug(f"[RAG] Query generation rationale: {getattr(result, 'rationale', 'N/A')}")
         return search_query
     
-    def _build_cited_papers(
-        self,
-        source_ids: List[str],
-        retrieved_papers: list
-    ) -> List[CitedPaper]:
-        """
-        Match DSPy-returned source IDs against already-retrieved papers to build
-        CitedPaper objects without extra DB calls.
-        Citation number is the 1-based position in the sources list.
-        """
-        paper_map = {p.id: p for p in retrieved_papers}
-        cited = []
-        seen = set()
-        for i, pid in enumerate(source_ids, 1):
-            if pid in seen:
-                continue
-            seen.add(pid)
-            paper = paper_map.get(pid)
-            if paper:
-                cited.append(CitedPaper(
-                    id=paper.id,
-                    title=paper.title,
-                    authors=paper.authors,
-                    abstract=paper.abstract,
-                    year=paper.year,
-                    citation_number=i,
-                ))
-        return cited
-
     def _convert_to_dspy_history(self, history_messages: Optional[List[dict]]) -> dspy.History:
         """
         Convert conversation history from request model to dspy.History.
@@ -380,7 +412,7 @@ class RAGService:
             dspy.History object with converted messages
         """
         if not history_messages:
-            return dspy.History(messages=[])
+            return EMPTY_HISTORY
         
         dspy_messages = []
         for msg in history_messages:
@@ -417,6 +449,26 @@ class RAGService:
         Returns:
             Dict with answer, sources, and optional rationale
         """
+        # Without history the result only depends on the question and settings
+        cache_key = None
+        if not history:
+            cache_key = chat_cache_key(question, language, source_preference)
+            cached = await get_cached_chat(cache_key)
+            if cached is not None:
+                logger.info("[RAG] Chat cache hit, skipping retrieval and generation")
+                cached["sources"] = CITED_PAPERS_ADAPTER.validate_python(cached["sources"])
+                return cached
+
+        result = await self._chat(question, history)
+        if cache_key:
+            await cache_chat(cache_key, {
+                **result,
+                "sources": CITED_PAPERS_ADAPTER.dump_python(result["sources"], mode="json"),
+            })
+        return result
+
+    async def _chat(self, question: str, history: Optional[List[dict]]) -> dict:
+        """Uncached body of chat(): intent → retrieval → answer → gap refinement."""
         logger.info(f"[RAG] Processing question: '{question}'")
         if history:
             logger.info(f"[RAG] Using conversation history with {len(history)} previous turns")
@@ -424,19 +476,27 @@ class RAGService:
         # Convert history to dspy.History format
         dspy_history = self._convert_to_dspy_history(history)
         
-        # Step 0: Classify intent
-        logger.info("[RAG] Classifying intent...")
-        if self.cheap_lm:
-            with dspy.context(lm=self.cheap_lm):
-                intent_res = self.intent_classifier(question=question)
+        # DSPy modules are awaited natively (acall), so concurrent requests overlap
+        # their LM round-trips on the event loop without holding a pool thread each
+
+        # Step 0: Classify intent and generate the search query in one call,
+        # unless a bare greeting makes the answer obvious without an LM call
+        if is_obviously_chitchat(question):
+            logger.info("[RAG] Greeting detected. Skipping intent classification.")
+            category = "general"
         else:
-            intent_res = self.intent_classifier(question=question)
+            logger.info("[RAG] Classifying intent...")
+            intent_res = await run_dspy_async(
+                self.intent_query_classifier, cheap_lm=self.cheap_lm, question=question
+            )
+            category = intent_res.category
             
-        logger.info(f"[RAG] Intent classified: {intent_res.category} ({intent_res.explanation})")
+        logger.info(f"[RAG] Intent classified: {category}")
         
-        if intent_res.category == "general":
+        if category == "general":
             logger.info("[RAG] General intent detected. Skipping retrieval.")
-            result = self.rag_module(
+            result = await run_dspy_async(
+                self.rag_module,
                 question=question,
                 context="No paper context needed for this general query.",
                 history=dspy_history
@@ -448,8 +508,9 @@ class RAGService:
                 "search_query": None
             }
 
-        # Step 1: Generate optimized search query using LLM
-        search_query = self._generate_search_query(question)
+        # Step 1: Use the search query from the intent call, generating one only if empty
+        search_query = (intent_res.search_query or "").strip() or await self._generate_search_query(question)
+        logger.info(f"[RAG] Search query: '{search_query}'")
 
         # Step 2: Retrieve context + papers together (avoids extra DB calls later)
         logger.info(f"[RAG] Retrieving context with query: '{search_query}'")
@@ -458,11 +519,9 @@ class RAGService:
         # Zero-result retry (Improvement 1)
         if len(retrieved_papers) == 0 and self.query_reformulator:
             logger.info("[RAG] No papers found. Reforming query...")
-            if self.cheap_lm:
-                with dspy.context(lm=self.cheap_lm):
-                    reformulation = self.query_reformulator(original_query=search_query)
-            else:
-                reformulation = self.query_reformulator(original_query=search_query)
+            reformulation = await run_dspy_async(
+                self.query_reformulator, cheap_lm=self.cheap_lm, original_query=search_query
+            )
             
             broader_query = reformulation.broader_query.strip()
             if broader_query and broader_query != search_query:
@@ -474,15 +533,16 @@ class RAGService:
 
         # Step 3: Generate answer with history context
         logger.info("[RAG] Generating answer with DSPy and conversation history...")
-        result = self.rag_module(
+        result = await run_dspy_async(
+            self.rag_module,
             question=question,
             context=context,
             history=dspy_history
         )
 
-        cited_papers = self._build_cited_papers(
+        cited_papers = build_cited_papers(
             getattr(result, 'sources', []),
-            retrieved_papers
+            {p.id: p for p in retrieved_papers}
         )
 
         final_answer = result.answer
@@ -492,11 +552,10 @@ class RAGService:
         if self.gap_detector:
             try:
                 logger.info("[RAG] Checking for gaps in answer...")
-                if self.cheap_lm:
-                    with dspy.context(lm=self.cheap_lm):
-                        gap_result = self.gap_detector(question=question, answer=final_answer)
-                else:
-                    gap_result = self.gap_detector(question=question, answer=final_answer)
+                gap_result = await run_dspy_async(
+                    self.gap_detector, cheap_lm=self.cheap_lm,
+                    question=question, answer=final_answer,
+                )
                 
                 if getattr(gap_result, "verdict", "complete") == "partial" and getattr(gap_result, "gap_query", "").strip():
                     gap_q = gap_result.gap_query.strip()
@@ -511,16 +570,17 @@ class RAGService:
                         all_unique_papers = retrieved_papers + [p for p in extra_papers if p.id not in seen_ids]
                         
                         logger.info("[RAG] Generating refined answer...")
-                        refined_result = self.rag_module(
+                        refined_result = await run_dspy_async(
+                            self.rag_module,
                             question=question,
                             context=enriched_context,
                             history=dspy_history
                         )
                         
                         final_answer = refined_result.answer
-                        final_sources = self._build_cited_papers(
+                        final_sources = build_cited_papers(
                             getattr(refined_result, 'sources', []),
-                            all_unique_papers
+                            {p.id: p for p in all_unique_papers}
                         )
             except Exception as e:
                 logger.warning(f"[RAG] Gap detection/refinement failed: {e}")
@@ -542,13 +602,12 @@ class RAGService:
         """
         try:
             predictor = dspy.Predict(TitleGenerationSignature)
-            ctx = dspy.context(lm=self.cheap_lm) if self.cheap_lm else contextlib.nullcontext()
-            with ctx:
-                result = await asyncio.to_thread(
-                    predictor,
-                    question=question,
-                    answer=answer[:500],  # truncate long answers
-                )
+            result = await run_dspy_async(
+                predictor,
+                cheap_lm=self.cheap_lm,
+                question=question,
+                answer=answer[:500],  # truncate long answers
+            )
             title = result.title.strip().strip('"').strip("'")
             logger.info("[RAG] Generated title: '%s'", title)
             return title
@@ -1,3 +1,5 @@
+import asyncio
+import heapq
 import logging
 import time
 import voyageai
@@ -7,9 +9,13 @@ from app.core.models import PaperResult
 from app.db.crud import CatalogCRUD
 from app.db.models import Catalog
 from app.config import get_settings
+from app.utils.proximity_cache import ProximityCache
 
 logger = logging.getLogger(__name__)
 
+# Reciprocal Rank Fusion constant; 60 is the value from the original RRF paper
+_RRF_K = 60
+
 
 class PaperRetriever:
     """
@@ -32,6 +38,12 @@ class PaperRetriever:
             self.voyage_client = None
             logger.warning("[RETRIEVER] VOYAGE_API_KEY not set. Vector search will be disabled.")
 
+        # Reuses vector results for near-identical query embeddings
+        self._proximity_cache = (
+            ProximityCache(settings.PROXIMITY_CACHE_SIZE, settings.PROXIMITY_CACHE_THRESHOLD)
+            if settings.PROXIMITY_CACHE_SIZE > 0 else None
+        )
+
     @asynccontextmanager
     async def _get_crud(self):
         """Context manager that yields a fresh CatalogCRUD with its own session."""
@@ -111,18 +123,42 @@ class PaperRetriever:
             try:
                 if use_vector and self.voyage_client:
                     embedding = await self._get_embedding(query)
+                    hybrid = get_settings().HYBRID_SEARCH
+                    # Keyword hits depend on the exact text, so fused results aren't reused
+                    proximity_cache = None if hybrid else self._proximity_cache
+                    cache_key = (limit, catalog_type, year_from, year_to)
+                    if proximity_cache is not None:
+                        cached = proximity_cache.get(embedding, cache_key)
+                        if cached is not None:
+                            return cached
+                    # Fusion needs a deeper candidate list than the final limit
+                    candidates = max(limit * 4, 20) if hybrid else limit
                     t0 = time.perf_counter()
-                    results = await crud.vector_search(
+                    vector_coro = crud.vector_search(
                         embedding=embedding,
-                        limit=limit,
+                        limit=candidates,
                         catalog_type=catalog_type,
                         year_from=year_from,
                         year_to=year_to
                     )
+                    if hybrid:
+                        results, keyword_results = await asyncio.gather(
+                            vector_coro,
+                            self._keyword_candidates(
+                                query, candidates, catalog_type, year_from, year_to
+                            ),
+                        )
+                        results = _rrf_fuse(results, keyword_results, limit=limit)
+                    else:
+                        results = await vector_coro
                     logger.info(
-                        "[RETRIEVER] pgvector search took %.2fs, returned %d results",
-                        time.perf_counter() - t0, len(results)
+                        "[RETRIEVER] pgvector search took %.2fs, returned %d results (hybrid=%s)",
+                        time.perf_counter() - t0, len(results), hybrid
                     )
+                    papers = [self._catalog_to_paper(c, score) for c, score in results]
+                    if proximity_cache is not None:
+                        proximity_cache.put(embedding, cache_key, papers)
+                    return papers
                 else:
                     results, _ = await crud.search(
                         query=query,
@@ -141,6 +177,26 @@ class PaperRetriever:
                     return await self.search(query, limit, catalog_type, year_from, year_to, use_vector=False)
                 raise
     
+    async def _keyword_candidates(
+        self,
+        query: str,
+        limit: int,
+        catalog_type: Optional[str],
+        year_from: Optional[int],
+        year_to: Optional[int],
+    ) -> List[tuple[Catalog, float]]:
+        """Keyword search on its own DB session, so it can run alongside vector search."""
+        async with self._get_crud() as crud:
+            if crud is None:
+                return []
+            return await crud.keyword_candidates(
+                query=query,
+                catalog_type=catalog_type,
+                year_from=year_from,
+                year_to=year_to,
+                limit=limit
+            )
+
     def _search_cache(self, query: str, limit: int) -> List[PaperResult]:
         """Search in cached papers (fallback)."""
         query_lower = query.lower()
@@ -219,3 +275,26 @@ class PaperRetriever:
                 return []
             catalogs = await crud.get_recent_by_year(year, limit)
             return [self._catalog_to_paper(c) for c in catalogs]
+
+
+def _rrf_fuse(
+    primary: List[tuple[Catalog, float]],
+    secondary: List[tuple[Catalog, float]],
+    limit: int,
+) -> List[tuple[Catalog, float]]:
+    """
+    Merge two ranked (catalog, score) lists with Reciprocal Rank Fusion.
+    Ranking uses only positions (sum of 1 / (k + rank)), so the cosine and
+    keyword scores never need to share a scale. The returned score is that
+    fused value, so every result's score is on the same scale.
+    """
+    fused: dict = {}
+    for ranked in (primary, secondary):
+        for rank, (catalog, _) in enumerate(ranked, 1):
+            entry = fused.get(catalog.id)
+            if entry is None:
+                fused[catalog.id] = [1.0 / (_RRF_K + rank), catalog]
+            else:
+                entry[0] += 1.0 / (_RRF_K + rank)
+    top = heapq.nlargest(limit, fused.values(), key=lambda entry: entry[0])
+    return [(catalog, score) for score, catalog in top]
@@ -84,8 +84,8 @@ class SessionManager:
             logger.info("[SESSION] Disconnected from Redis")
     
     def _get_session_key(self, conversation_id: str) -> str:
-        """Get Redis key for conversation."""
-        return f"conversation:{conversation_id}"
+        """Get Redis key for the conversation's message list (one JSON entry per turn)."""
+        return f"conversation:messages:{conversation_id}"
     
     def _get_metadata_key(self, conversation_id: str) -> str:
         """Get Redis key for conversation metadata."""
@@ -122,9 +122,11 @@ class SessionManager:
         if redis_ok:
             try:
                 meta_key = self._get_metadata_key(conversation_id)
-                await self._redis.setex(meta_key, self.default_ttl, json.dumps(session_metadata))
                 session_key = self._get_session_key(conversation_id)
-                await self._redis.setex(session_key, self.default_ttl, json.dumps([]))
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    pipe.setex(meta_key, self.default_ttl, json.dumps(session_metadata))
+                    pipe.delete(session_key)
+                    await pipe.execute()
             except Exception as e:
                 logger.warning("[SESSION] Redis create_session failed: %s", e)
                 self._redis = None
@@ -146,18 +148,23 @@ class SessionManager:
     
             try:
                 session_key = self._get_session_key(conversation_id)
-                data = await self._redis.get(session_key)
+                # Read and refresh the TTL of an active conversation in one round-trip
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    pipe.lrange(session_key, -limit if limit else 0, -1)
+                    pipe.expire(session_key, self.default_ttl)
+                    data, _ = await pipe.execute()
     
                 if not data:
                     logger.info("[SESSION] Redis miss for %s — loading from DB", conversation_id)
                     messages = await self.load_from_database(conversation_id, limit=limit or self.max_messages, user_id=user_id)
                     if messages:
-                        await self._redis.setex(session_key, self.default_ttl, json.dumps(messages))
+                        async with self._redis.pipeline(transaction=False) as pipe:
+                            pipe.rpush(session_key, *(json.dumps(m) for m in messages))
+                            pipe.expire(session_key, self.default_ttl)
+                            await pipe.execute()
                     return messages
     
-                messages = json.loads(data)
-                if limit and len(messages) > limit:
-                    messages = messages[-limit:]
+                messages = [json.loads(m) for m in data]
     
                 logger.info("[SESSION] Retrieved %d messages for: %s", len(messages), conversation_id)
                 return messages
@@ -191,14 +198,16 @@ class SessionManager:
             if redis_ok:
                 try:
                     session_key = self._get_session_key(conversation_id)
-                    data = await self._redis.get(session_key)
-                    messages = json.loads(data) if data else []
-                    messages.append(message)
-                    if len(messages) > self.max_messages:
-                        messages = messages[-self.max_messages:]
-                    await self._redis.setex(session_key, self.default_ttl, json.dumps(messages))
-                    await self._update_metadata(conversation_id, len(messages))
-                    logger.info("[SESSION] Added message to %s (total: %d)", conversation_id, len(messages))
+                    async with self._redis.pipeline(transaction=False) as pipe:
+                        pipe.rpush(session_key, json.dumps(message))
+                        pipe.ltrim(session_key, -self.max_messages, -1)
+                        pipe.expire(session_key, self.default_ttl)
+                        pipe.llen(session_key)
+                        # Fetch metadata in the same round-trip for _update_metadata
+                        pipe.get(self._get_metadata_key(conversation_id))
+                        *_, total, meta_data = await pipe.execute()
+                    await self._update_metadata(conversation_id, total, meta_data)
+                    logger.info("[SESSION] Added message to %s (total: %d)", conversation_id, total)
                 except Exception as e:
                     logger.warning("[SESSION] Redis write failed: %s. Persisting to DB only.", e)
                     self._redis = None
@@ -207,13 +216,19 @@ class SessionManager:
             await self._save_to_database(conversation_id, message, user_id=user_id)
             return True
     
-    async def _update_metadata(self, conversation_id: str, message_count: int):
-        """Update session metadata in Redis (best-effort)."""
+    async def _update_metadata(
+        self, conversation_id: str, message_count: int, data: Optional[str] = None
+    ):
+        """
+        Update session metadata in Redis (best-effort).
+        `data` is the already-fetched metadata JSON; it is read here when omitted.
+        """
         if self._redis is None:
             return
         try:
             meta_key = self._get_metadata_key(conversation_id)
-            data = await self._redis.get(meta_key)
+            if data is None:
+                data = await self._redis.get(meta_key)
             if data:
                 metadata = json.loads(data)
                 metadata["last_activity"] = datetime.utcnow().isoformat()
@@ -260,8 +275,10 @@ class SessionManager:
         session_key = self._get_session_key(conversation_id)
         meta_key = self._get_metadata_key(conversation_id)
         
-        await self._redis.expire(session_key, self.default_ttl + extra_seconds)
-        await self._redis.expire(meta_key, self.default_ttl + extra_seconds)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.expire(session_key, self.default_ttl + extra_seconds)
+            pipe.expire(meta_key, self.default_ttl + extra_seconds)
+            await pipe.execute()
         
         logger.info(f"[SESSION] Extended TTL for {conversation_id}")
     
@@ -283,26 +300,15 @@ class SessionManager:
         await self.connect()
         
         session_key = self._get_session_key(conversation_id)
-        data = await self._redis.get(session_key)
-        
-        if not data:
-            return 0
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.llen(session_key)
+            pipe.ltrim(session_key, -keep_last_n, -1)
+            original_count, _ = await pipe.execute()
         
-        messages = json.loads(data)
-        original_count = len(messages)
-        
-        if original_count > keep_last_n:
-            messages = messages[-keep_last_n:]
-            await self._redis.setex(
-                session_key,
-                self.default_ttl,
-                json.dumps(messages)
-            )
-            removed = original_count - keep_last_n
+        removed = max(0, original_count - keep_last_n)
+        if removed:
             logger.info(f"[SESSION] Pruned {removed} messages from {conversation_id}")
-            return removed
-        
-        return 0
+        return removed
     
     async def _save_to_database(
             self, conversation_id: str, message: Dict, user_id: Optional[str] = None
@@ -0,0 +1,79 @@
+"""
+Redis-backed cache for final answers.
+Lets a repeated question over the same retrieved papers (or a repeated general
+question, with no papers) skip the answer LLM call. Non-streaming chat results
+are cached whole, keyed on the question alone, so a hit skips retrieval too.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Iterable, Optional
+
+from app.utils.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL = 3600  # 1 hour
+
+
+def _normalize_question(question: str) -> str:
+    """Case- and whitespace-insensitive form, ignoring trailing punctuation."""
+    return " ".join(question.lower().split()).rstrip("?!. ")
+
+
+def answer_cache_key(
+    question: str,
+    language: str,
+    source_preference: str,
+    paper_ids: Iterable,
+) -> str:
+    ids = ",".join(sorted({str(i) for i in paper_ids}))
+    raw = f"{_normalize_question(question)}|{language}|{source_preference}|{ids}"
+    return f"answer:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+def chat_cache_key(question: str, language: str, source_preference: str) -> str:
+    raw = f"{_normalize_question(question)}|{language}|{source_preference}"
+    return f"chat:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+async def _get_json(key: str) -> Optional[dict]:
+    r = await get_redis()
+    if r is None:
+        return None
+    try:
+        data = await r.get(key)
+        if data:
+            return json.loads(data)
+    except Exception as e:
+        logger.warning("[ANSWER_CACHE] Read error: %s", e)
+    return None
+
+
+async def _set_json(key: str, value: dict) -> None:
+    r = await get_redis()
+    if r is None:
+        return
+    try:
+        await r.setex(key, CACHE_TTL, json.dumps(value))
+    except Exception as e:
+        logger.warning("[ANSWER_CACHE] Write error: %s", e)
+
+
+async def get_cached_answer(key: str) -> Optional[dict]:
+    """Returns {"answer": str, "sources": [paper_id, ...]} or None."""
+    return await _get_json(key)
+
+
+async def cache_answer(key: str, answer: str, sources: list) -> None:
+    await _set_json(key, {"answer": answer, "sources": sources})
+
+
+async def get_cached_chat(key: str) -> Optional[dict]:
+    """Returns a cached RAGService.chat result (sources as plain dicts) or None."""
+    return await _get_json(key)
+
+
+async def cache_chat(key: str, result: dict) -> None:
+    await _set_json(key, result)
@@ -0,0 +1,67 @@
+"""
+Helpers for running DSPy modules without blocking the event loop.
+Modules with an aforward() are awaited natively; blocking calls go to a shared
+thread pool, so concurrent requests overlap their LM calls either way.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import dspy
+
+from app.config import get_settings
+
+# nullcontext is reusable and reentrant, so one instance serves every call.
+# dspy.context() is a single-use generator context manager and cannot be shared.
+_NULL_CTX = contextlib.nullcontext()
+
+# dspy.History is frozen, so one empty instance can be shared by every request
+EMPTY_HISTORY = dspy.History(messages=[])
+
+
+def lm_context(lm: Any):
+    """Context that switches DSPy to `lm`, or the shared no-op context when unset."""
+    return dspy.context(lm=lm) if lm else _NULL_CTX
+
+# Shared, bounded pool for blocking DSPy calls. asyncio.to_thread would use the
+# loop's default executor, which every other to_thread caller competes for.
+# Workers mostly wait on LM HTTP calls, so size it by expected concurrent DSPy
+# calls (streams x ~3 parallel calls each), not by CPU count.
+_DSPY_POOL = ThreadPoolExecutor(
+    max_workers=get_settings().DSPY_POOL_SIZE, thread_name_prefix="dspy"
+)
+
+
+def shutdown_dspy_pool() -> None:
+    """
+    Drop queued DSPy calls and stop the pool without waiting for running ones.
+    Called from the app lifespan: an atexit hook would be too late, since
+    concurrent.futures joins its workers (draining the queue) before atexit runs.
+    """
+    _DSPY_POOL.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_in_dspy_pool(fn, /, **kwargs):
+    """Run ``fn(**kwargs)`` on the DSPy pool, carrying over contextvars like to_thread."""
+    ctx = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        _DSPY_POOL, functools.partial(ctx.run, fn, **kwargs)
+    )
+
+
+async def run_dspy_sync(fn, cheap_lm=None, **kwargs):
+    """Run a blocking DSPy call in a thread pool so it doesn't stall the event loop."""
+    def _call():
+        with lm_context(cheap_lm):
+            return fn(**kwargs)
+    return await run_in_dspy_pool(_call)
+
+
+async def run_dspy_async(module, cheap_lm=None, **kwargs):
+    """Await a DSPy module's native async path (acall), switching to `cheap_lm` if set."""
+    with lm_context(cheap_lm):
+        return await module.acall(**kwargs)
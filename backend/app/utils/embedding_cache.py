@@ -8,33 +8,12 @@ import json
 import logging
 from typing import List, Optional
 
+from app.utils.redis_client import get_redis
+
 logger = logging.getLogger(__name__)
 
 CACHE_TTL = 86400  # 24 hours
 
-_redis = None
-
-
-async def _get_redis():
-    """Lazily connect to Redis; returns None if unavailable."""
-    global _redis
-    if _redis is not None:
-        return _redis
-
-    from app.config import get_settings
-    redis_url = get_settings().REDIS_URL
-    try:
-        from redis import asyncio as aioredis
-        client = await aioredis.from_url(redis_url, decode_responses=False)
-        await client.ping()
-        _redis = client
-        logger.info("[EMBED_CACHE] Connected to Redis at %s", redis_url)
-    except Exception as e:
-        logger.warning("[EMBED_CACHE] Redis unavailable, embedding cache disabled: %s", e)
-        _redis = None
-
-    return _redis
-
 
 def _cache_key(text: str, model: str) -> str:
     h = hashlib.sha256(f"{model}:{text}".encode()).hexdigest()
@@ -42,7 +21,7 @@ def _cache_key(text: str, model: str) -> str:
 
 
 async def get_cached_embedding(text: str, model: str) -> Optional[List[float]]:
-    r = await _get_redis()
+    r = await get_redis()
     if r is None:
         return None
     try:
@@ -55,7 +34,7 @@ async def get_cached_embedding(text: str, model: str) -> Optional[List[float]]:
 
 
 async def cache_embedding(text: str, model: str, embedding: List[float]) -> None:
-    r = await _get_redis()
+    r = await get_redis()
     if r is None:
         return
     try:
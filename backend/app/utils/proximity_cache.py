@@ -0,0 +1,62 @@
+"""
+In-process approximate cache for vector search results.
+A query whose embedding is within a cosine threshold of a recently searched
+one (same filters) reuses that search's papers and skips the pgvector query.
+"""
+
+import logging
+import time
+from typing import Hashable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL = 600  # 10 minutes, so newly ingested papers show up reasonably soon
+
+
+class ProximityCache:
+    """
+    Fixed-size ring buffer of (unit embedding, filter key, results).
+    Lookup is one matrix-vector product over the stored embeddings.
+    """
+
+    def __init__(self, capacity: int = 256, threshold: float = 0.97):
+        self.capacity = capacity
+        self.threshold = threshold
+        self._embs: Optional[np.ndarray] = None  # allocated on first put, once dim is known
+        self._keys: List[Optional[Hashable]] = [None] * capacity
+        self._values: List[Optional[list]] = [None] * capacity
+        self._stored_at = np.zeros(capacity)
+        self._size = 0
+        self._next = 0
+
+    @staticmethod
+    def _unit(embedding: Sequence[float]) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def get(self, embedding: Sequence[float], key: Hashable) -> Optional[list]:
+        """Return cached results for the closest fresh match above the threshold, or None."""
+        if self._size == 0:
+            return None
+        sims = self._embs[:self._size] @ self._unit(embedding)
+        sims[self._stored_at[:self._size] < time.monotonic() - CACHE_TTL] = -1.0
+        candidates = np.flatnonzero(sims >= self.threshold)
+        for idx in candidates[np.argsort(-sims[candidates])]:
+            if self._keys[idx] == key:
+                logger.info("[PROXIMITY_CACHE] Hit (cosine %.3f)", sims[idx])
+                return list(self._values[idx])
+        return None
+
+    def put(self, embedding: Sequence[float], key: Hashable, value: list) -> None:
+        vec = self._unit(embedding)
+        if self._embs is None:
+            self._embs = np.zeros((self.capacity, vec.shape[0]), dtype=np.float32)
+        self._embs[self._next] = vec
+        self._keys[self._next] = key
+        self._values[self._next] = list(value)
+        self._stored_at[self._next] = time.monotonic()
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
@@ -0,0 +1,53 @@
+"""
+Shared lazy Redis client for the best-effort caches (embeddings, answers).
+One connection pool serves every cache; when Redis is down, callers get None
+and reconnection is retried at most once per RETRY_AFTER seconds.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 1.0  # seconds; a cache must not stall a request on connect
+RETRY_AFTER = 30.0  # seconds to wait after a failed connect before trying again
+
+_redis = None
+_retry_at = 0.0
+_lock: Optional[asyncio.Lock] = None
+
+
+async def get_redis():
+    """Return the shared Redis client, or None if Redis is unavailable."""
+    global _redis, _retry_at, _lock
+    if _redis is not None:
+        return _redis
+    if time.monotonic() < _retry_at:
+        return None
+
+    if _lock is None:
+        _lock = asyncio.Lock()
+    async with _lock:
+        # Another caller may have connected (or failed) while we waited
+        if _redis is not None or time.monotonic() < _retry_at:
+            return _redis
+
+        from app.config import get_settings
+        redis_url = get_settings().REDIS_URL
+        try:
+            from redis import asyncio as aioredis
+            client = await aioredis.from_url(
+                redis_url, decode_responses=False, socket_connect_timeout=CONNECT_TIMEOUT
+            )
+            await client.ping()
+            _redis = client
+            logger.info("[REDIS] Connected to Redis at %s", redis_url)
+        except Exception as e:
+            _retry_at = time.monotonic() + RETRY_AFTER
+            logger.warning(
+                "[REDIS] Redis unavailable, caches disabled for %.0fs: %s", RETRY_AFTER, e
+            )
+
+    return _redis
@@ -6,38 +6,110 @@ Implements a Manus-like planning + execution UX:
 """
 
 import asyncio
-import contextlib
-import json
 import logging
+import re
 import time
+from dataclasses import dataclass
 from typing import Any, AsyncGenerator, List
 
 import dspy
-
-from app.core.models import CitedPaper
+from pydantic import TypeAdapter
+
+from app.config import get_settings
+from app.core.exceptions import ClientTooSlow
+from app.core.models import CITED_PAPERS_ADAPTER, CitedPaper
+from app.utils.answer_cache import answer_cache_key, cache_answer, get_cached_answer
+from app.utils.dspy_executor import EMPTY_HISTORY, lm_context, run_dspy_sync
+from app.services.intent_heuristics import is_obviously_chitchat, is_obviously_research
 from app.services.planner import PlanStep, ResearchPlanner, default_plan
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:  # optional speedup; identical compact output via stdlib
+    import json
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
 logger = logging.getLogger(__name__)
 
+# Serialize whole lists in pydantic-core instead of one model_dump() per item
+_STEPS_TA = TypeAdapter(List[PlanStep])
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def format_sse(data: dict) -> str:
-    return f"data: {json.dumps(data)}\n\n"
+def format_sse(data: dict) -> bytes:
+    return b"data: " + _dumps(data) + b"\n\n"
+
+
+# Pre-serialized frames for events whose payload never changes.
+_DONE_SENTINEL = b"data: [DONE]\n\n"
+_ANSWER_START_SSE = format_sse({"type": "answer_start"})
+_SIMPLE_THINKING_SSE = format_sse(
+    {"type": "simple_thinking", "message": "OpenTA is thinking..."}
+)
+_STATUS_CLASSIFYING_SSE = format_sse(
+    {"type": "status", "step": "classifying", "message": "Understanding your question..."}
+)
+_STATUS_CLASSIFIED_RESEARCH_SSE = format_sse(
+    {"type": "status", "step": "classified", "message": "Research question detected"}
+)
+_STATUS_CLASSIFIED_GENERAL_SSE = format_sse(
+    {
+        "type": "status",
+        "step": "classified",
+        "message": "General question — no paper search needed",
+    }
+)
+_STATUS_PLANNING_SSE = format_sse(
+    {"type": "status", "step": "planning", "message": "Planning approach..."}
+)
+
+
+# Token-like frames only vary by their content, so the envelope is spliced
+# around the JSON-encoded chunk instead of serializing a dict per token.
+_TOKEN_PREFIX = b'data: {"type":"token","content":'
+_REFINEMENT_TOKEN_PREFIX = b'data: {"type":"refinement_token","content":'
+_TOKEN_SUFFIX = b"}\n\n"
+
+
+def _token_frame(chunk: str, prefix: bytes = _TOKEN_PREFIX) -> bytes:
+    return prefix + _dumps(chunk) + _TOKEN_SUFFIX
+
+
+def _step_thinking_prefix(step_id: int) -> bytes:
+    return b'data: {"type":"step_thinking","step_id":%d,"content":' % step_id
+
 
+def _emit_multi(*frames: bytes) -> bytes:
+    """Join back-to-back frames so they go out as one ASGI body message."""
+    return b"".join(frames)
 
-def _build_cited_papers(
-    source_ids: List[str], retrieved_papers: list
+
+_STEP_DONE_FMT = b'data: {"type":"step_done","step_id":%d}\n\n'
+
+
+def _done_frame(answer: str, sources: list, include_answer: bool) -> bytes:
+    """The 'done' frame; `content` repeats the streamed tokens, so it is optional."""
+    if include_answer:
+        return format_sse({"type": "done", "content": answer, "sources": sources})
+    return format_sse({"type": "done", "sources": sources})
+
+
+def build_cited_papers(
+    source_ids: List[str], paper_map: dict
 ) -> List[CitedPaper]:
-    paper_map = {p.id: p for p in retrieved_papers}
+    """
+    Match DSPy-returned source IDs against already-retrieved papers (keyed by
+    id in `paper_map`) to build CitedPaper objects without extra DB calls.
+    Citation number is the 1-based position in the deduplicated sources list.
+    """
     cited: List[CitedPaper] = []
-    seen: set = set()
-    for i, pid in enumerate(source_ids, 1):
-        if pid in seen:
-            continue
-        seen.add(pid)
+    for i, pid in enumerate(dict.fromkeys(source_ids), 1):
         paper = paper_map.get(pid)
         if paper:
             cited.append(
@@ -53,13 +125,12 @@ def _build_cited_papers(
     return cited
 
 
-def _paper_summary(papers: list) -> str:
-    if not papers:
-        return "No papers retrieved yet."
-    lines = ["Retrieved papers:"]
-    for i, p in enumerate(papers, 1):
-        lines.append(f"  {i}. {p.title} ({p.year})")
-    return "\n".join(lines)
+def _paper_summary_lines(papers: list, start: int = 1):
+    """Numbered summary lines for `papers`, numbering from `start`."""
+    return (f"  {i}. {p.title} ({p.year})" for i, p in enumerate(papers, start))
+
+
+_CITATION_RE = re.compile(r'\[(\d+)\]')
 
 
 def _audit_citations(answer: str, cited_papers: list) -> dict:
@@ -69,8 +140,7 @@ def _audit_citations(answer: str, cited_papers: list) -> dict:
     the number of actually retrieved papers.
     No LLM call — zero latency overhead.
     """
-    import re
-    cited_nums = {int(n) for n in re.findall(r'\[(\d+)\]', answer)}
+    cited_nums = {int(n) for n in _CITATION_RE.findall(answer)}
     valid_nums = {p.citation_number for p in cited_papers}
     hallucinated = sorted(cited_nums - valid_nums)
     return {
@@ -81,17 +151,10 @@ def _audit_citations(answer: str, cited_papers: list) -> dict:
     }
 
 
-# ---------------------------------------------------------------------------
-# DSPy async helpers
-# ---------------------------------------------------------------------------
-
-async def _run_dspy_sync(fn, cheap_lm=None, **kwargs):
-    """Run a blocking DSPy call in a thread pool so it doesn't stall the event loop."""
-    def _call():
-        ctx = dspy.context(lm=cheap_lm) if cheap_lm else contextlib.nullcontext()
-        with ctx:
-            return fn(**kwargs)
-    return await asyncio.to_thread(_call)
+_COMPLEX_RE = re.compile(
+    r"\b(?:compare|comparison|differences?|versus|vs|also|additionally|furthermore|contrast)\b",
+    re.IGNORECASE,
+)
 
 
 def _should_use_default_plan(question: str) -> bool:
@@ -100,18 +163,242 @@ def _should_use_default_plan(question: str) -> bool:
     A question is considered simple if it has fewer than 20 words and no
     multi-faceted keywords that suggest a comparative or multi-step analysis.
     """
-    words = question.split()
-    if len(words) >= 20:
+    # At most 20 pieces: stops splitting once the word limit is reached
+    if len(question.split(None, 19)) >= 20:
         return False
-    complex_keywords = {"compare", "comparison", "difference", "differences", "versus",
-                        "vs", "also", "additionally", "furthermore", "contrast"}
-    return not any(w.lower().strip("?,.:") in complex_keywords for w in words)
+    return _COMPLEX_RE.search(question) is None
+
+
+def _streamify(program: Any, field: str):
+    """
+    Wrap `program` with dspy.streamify, streaming `field` token by token.
+
+    Built fresh on every call on purpose: StreamListener keeps per-stream
+    parsing state (stream_start, buffered tokens) and the wrapper holds on to
+    its listeners, so a cached wrapper would be shared by concurrent streams.
+    The wrapper itself is cheap compared with the LM call it precedes.
+    """
+    return dspy.streamify(
+        program,
+        stream_listeners=[dspy.streaming.StreamListener(signature_field_name=field)],
+    )
+
+
+async def _replay_cached_answer(cached: dict):
+    """
+    Re-emits a cached answer the way dspy.streamify would: a chunk, then a
+    Prediction. The whole answer is already known, so it goes out as a single
+    chunk (one token frame) rather than a burst of tiny ones.
+    """
+    yield dspy.streaming.StreamResponse("answer_cache", "answer", cached["answer"], False)
+    yield dspy.Prediction(answer=cached["answer"], sources=cached["sources"])
+
+
+_BATCH_END = object()
+
+
+@dataclass
+class _MergedResponse(dspy.streaming.StreamResponse):
+    """A StreamResponse built from `merged` consecutive LM chunks."""
+    merged: int = 1
+
+
+def _chunk_count(value: dspy.streaming.StreamResponse) -> int:
+    """Number of LM chunks behind `value` (1 unless it was microbatched)."""
+    return getattr(value, "merged", 1)
+
+
+async def _pump_into(stream, queue: asyncio.Queue) -> None:
+    """Drain `stream` into `queue`, always finishing with _BATCH_END."""
+    try:
+        async for item in stream:
+            queue.put_nowait(item)
+    finally:
+        queue.put_nowait(_BATCH_END)
+
+
+def _prefetch(stream) -> tuple[AsyncGenerator, asyncio.Task]:
+    """
+    Start consuming `stream` in the background right away.
+    Returns a generator that replays its items in order, and the pump task
+    (cancel it if the generator may never be iterated).
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    pump = asyncio.create_task(_pump_into(stream, queue))
+
+    async def _replay():
+        try:
+            while (item := await queue.get()) is not _BATCH_END:
+                yield item
+            await pump  # re-raise anything the stream raised
+        finally:
+            pump.cancel()
+
+    return _replay(), pump
+
+
+async def _microbatch(
+    stream, max_chunks: int = 16, max_delay_ms: int = 10, max_chars: int = 8192
+):
+    """
+    Coalesce consecutive StreamResponse chunks from a dspy.streamify stream.
+
+    Buffered chunks are merged into a single StreamResponse (recording how
+    many LM chunks it holds, see _chunk_count) once `max_chunks`
+    have arrived, `max_chars` of text are pending, or `max_delay_ms` has passed
+    since the first one; any other value flushes the buffer and passes through
+    unchanged. The stream is drained in its own task because streamify holds an
+    anyio task group that must be entered and exited by the same task.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def _merged() -> _MergedResponse:
+        return _MergedResponse(
+            last.predict_name, last.signature_field_name, "".join(parts),
+            last.is_last_chunk, len(parts),
+        )
+
+    loop = asyncio.get_running_loop()
+    max_delay = max_delay_ms / 1000
+    pump = asyncio.create_task(_pump_into(stream, queue))
+    parts: list[str] = []
+    size = 0
+    last = None
+    deadline = 0.0
+    try:
+        while True:
+            if parts and (
+                len(parts) >= max_chunks or size >= max_chars or loop.time() >= deadline
+            ):
+                yield _merged()
+                parts = []
+                size = 0
+
+            if not parts:
+                value = await queue.get()
+            elif not queue.empty():
+                value = queue.get_nowait()
+            else:
+                try:
+                    value = await asyncio.wait_for(queue.get(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    continue
+
+            if value is _BATCH_END:
+                break
+            if isinstance(value, dspy.streaming.StreamResponse) and value.chunk:
+                if not parts:
+                    deadline = loop.time() + max_delay
+                parts.append(value.chunk)
+                size += len(value.chunk)
+                last = value
+                continue
+            if parts:
+                yield _merged()
+                parts = []
+                size = 0
+            yield value
+
+        if parts:
+            yield _merged()
+        await pump  # re-raise anything the stream raised
+    finally:
+        pump.cancel()
+
+
+async def _start_final_answer(
+    dspy_program: Any,
+    question: str,
+    history: Any,
+    paper_map: dict,
+    all_context_parts: list[str],
+    language: str,
+    source_preference: str,
+) -> tuple[str, str | None, dict | None, AsyncGenerator]:
+    """
+    Builds the final answer stream from everything retrieved so far.
+    Returns (combined_context, answer_key, cached_answer, answer_stream).
+    - paper_map holds the unique retrieved papers by id.
+    - answer_key is None when the answer cache does not apply.
+    - cached_answer is the cache hit being replayed, or None.
+    """
+    combined_context = (
+        "\n\n".join(all_context_parts)
+        if all_context_parts
+        else "No paper context available for this general question."
+    )
+
+    # Answers only depend on the question and papers when there is no history
+    answer_key = None
+    cached_answer = None
+    if paper_map and not history.messages:
+        answer_key = answer_cache_key(question, language, source_preference, paper_map)
+        cached_answer = await get_cached_answer(answer_key)
+
+    if cached_answer is not None:
+        logger.info("[STREAM] Answer cache hit, skipping final answer LLM call")
+        answer_stream = _replay_cached_answer(cached_answer)
+    else:
+        logger.info("[STREAM] Generating final answer...")
+        streaming_program = _streamify(dspy_program, "answer")
+        answer_stream = _microbatch(streaming_program(
+            question=question, context=combined_context, history=history
+        ))
+
+    return combined_context, answer_key, cached_answer, answer_stream
+
+
+def _start_completion_tasks(
+    on_complete: Any,
+    generate_title: Any,
+    question: str,
+    answer: str,
+    sources: list,
+    search_query: str | None,
+) -> tuple[asyncio.Task | None, asyncio.Task | None]:
+    """Starts history saving and title generation; either task is None when not requested."""
+    oc_task = (
+        asyncio.create_task(
+            on_complete(answer=answer, sources=sources, search_query=search_query)
+        )
+        if on_complete
+        else None
+    )
+    title_task = (
+        asyncio.create_task(generate_title(question=question, answer=answer))
+        if generate_title
+        else None
+    )
+    return oc_task, title_task
+
+
+async def _finish_completion_tasks(
+    oc_task: asyncio.Task | None, title_task: asyncio.Task | None
+) -> str | None:
+    """Waits for both completion tasks and returns the generated title, if any."""
+    pending = [t for t in (oc_task, title_task) if t is not None]
+    if pending:
+        await asyncio.wait(pending)
+    if oc_task is not None and oc_task.exception() is not None:
+        logger.warning("[STREAM] on_complete failed: %s", oc_task.exception())
+    if title_task is None:
+        return None
+    if title_task.exception() is not None:
+        logger.warning("[STREAM] Title generation error: %s", title_task.exception())
+        return None
+    return title_task.result()
 
 
 # ---------------------------------------------------------------------------
 # Step execution helpers
 # ---------------------------------------------------------------------------
 
+async def _search_pre_generated(query_task: asyncio.Task, retriever: Any) -> tuple[str, list]:
+    """Retrieval for the pre-generated query, started as soon as that query exists."""
+    query_result = await query_task
+    return await retriever.get_papers_with_context(query_result.search_query)
+
+
 async def _execute_search_step(
     step: PlanStep,
     question: str,
@@ -120,11 +407,14 @@ async def _execute_search_step(
     cheap_lm: Any,
     pre_generated_query: str | None = None,
     query_reformulator: Any = None,
+    prefetched: asyncio.Task | None = None,
 ) -> tuple[str, list, str, str | None]:
     """
     Runs query generation + retrieval for a search step.
     Returns (search_query, papers, context_string, original_query_if_reformulated).
     - If pre_generated_query is provided it is used directly.
+    - If prefetched is provided it must be a retrieval task already started for
+      pre_generated_query; its result is awaited instead of searching again.
     - If retrieval returns 0 papers and query_reformulator is provided,
       reformulates the query and retries once.
     - original_query_if_reformulated is non-None only when reformulation occurred.
@@ -132,19 +422,22 @@ async def _execute_search_step(
     if pre_generated_query:
         search_query = pre_generated_query
     elif query_generator:
-        query_result = await _run_dspy_sync(
+        query_result = await run_dspy_sync(
             query_generator, cheap_lm=cheap_lm, user_question=question
         )
         search_query = query_result.search_query
     else:
         search_query = question
 
-    context, papers = await retriever.get_papers_with_context(search_query)
+    if prefetched is not None:
+        context, papers = await prefetched
+    else:
+        context, papers = await retriever.get_papers_with_context(search_query)
 
     # Zero-result retry: reformulate and try once more
     if len(papers) == 0 and query_reformulator:
         original_query = search_query
-        reformulation = await _run_dspy_sync(
+        reformulation = await run_dspy_sync(
             query_reformulator, cheap_lm=cheap_lm, original_query=search_query
         )
         broader_query = reformulation.broader_query.strip()
@@ -161,34 +454,24 @@ async def _stream_step_thinking(
     question: str,
     gathered_context: str,
     cheap_lm: Any,
-) -> AsyncGenerator[str, None]:
+) -> AsyncGenerator[bytes, None]:
     """Streams the thinking for a single step via SSE step_thinking events."""
-    streaming_thinker = dspy.streamify(
-        planner.step_thinker,
-        stream_listeners=[
-            dspy.streaming.StreamListener(signature_field_name="thinking")
-        ],
-    )
+    streaming_thinker = _streamify(planner.step_thinker, "thinking")
+    thinking_prefix = _step_thinking_prefix(step.id)
 
-    ctx = dspy.context(lm=cheap_lm) if cheap_lm else contextlib.nullcontext()
-    with ctx:
-        async for value in streaming_thinker(
+    # The microbatch pump task is created inside the context, so it inherits the LM
+    with lm_context(cheap_lm):
+        async for value in _microbatch(streaming_thinker(
             question=question,
             step_title=step.title,
             step_description=step.description,
             gathered_context=gathered_context,
-        ):
+        )):
             if (
                 isinstance(value, dspy.streaming.StreamResponse)
                 and value.chunk
             ):
-                yield format_sse(
-                    {
-                        "type": "step_thinking",
-                        "step_id": step.id,
-                        "content": value.chunk,
-                    }
-                )
+                yield _token_frame(value.chunk, thinking_prefix)
 
 
 # ---------------------------------------------------------------------------
@@ -212,11 +495,18 @@ async def stream_dspy_response(
     generate_title: Any = None,
     query_reformulator: Any = None,
     gap_detector: Any = None,
-) -> AsyncGenerator[str, None]:
+    intent_query_classifier: Any = None,
+    include_final_answer: bool = True,
+) -> AsyncGenerator[bytes, None]:
     """
+    intent_query_classifier: dspy module returning both `category` and
+                     `search_query`; when provided it replaces the separate
+                     intent_classifier and query_generator calls.
     on_complete:     async callable(answer, sources, search_query) — save history.
     generate_title:  async callable(question, answer) -> str — generate conversation
                      title; when provided a 'title' SSE event is emitted after 'done'.
+    include_final_answer: when False, 'done' omits `content`; clients that
+                     accumulate 'token' events already have the full answer.
     """
     """
     Stream a planning-first agent response as SSE events.
@@ -231,79 +521,99 @@ async def stream_dspy_response(
       step_done     { step_id }
       answer_start  {}
       token         { content }            ← streamed tokens
-      done          { content, sources[] }
+      done          { content?, sources[] }  ← content unless include_final_answer=False
       error         { content }
     """
-    start_time = time.time()
+    start_ns = time.monotonic_ns()
     token_count = 0
+    answer_stream = None
+    intent_task: asyncio.Task | None = None
+    query_task: asyncio.Task | None = None
+    ack_task: asyncio.Task | None = None
+    retrieval_task: asyncio.Task | None = None
+    answer_prefetch: asyncio.Task | None = None
+    gap_task: asyncio.Task | None = None
 
     if history is None:
-        history = dspy.History(messages=[])
+        history = EMPTY_HISTORY
 
     logger.info("[STREAM] Starting for question: '%s'", question)
+    # Skip building hot-path log arguments when INFO is off (e.g. production)
+    log_info = logger.isEnabledFor(logging.INFO)
 
     try:
         # ------------------------------------------------------------------ #
         # 1. Show thinking state (shimmer in UI)                             #
         # ------------------------------------------------------------------ #
-        yield format_sse(
-            {"type": "simple_thinking", "message": "OpenTA is thinking..."}
-        )
+        yield _SIMPLE_THINKING_SSE
 
         # ------------------------------------------------------------------ #
         # 2. Classify intent + pre-generate query in parallel                 #
         # ------------------------------------------------------------------
-        yield format_sse(
-            {"type": "status", "step": "classifying", "message": "Understanding your question..."}
-        )
-
-        t_intent_start = time.perf_counter()
+        yield _STATUS_CLASSIFYING_SSE
 
-        intent_task = None
-        query_task = None
+        t_intent_start = time.perf_counter_ns()
 
-        if intent_classifier:
+        obviously_research = is_obviously_research(question)
+        obviously_chitchat = not obviously_research and is_obviously_chitchat(question)
+        if obviously_chitchat:
+            logger.info("[STREAM] Intent: general (greeting heuristic, no classifier call)")
+        elif intent_query_classifier:
+            # One cheap-LM round-trip yields both the category and the query
+            query_task = asyncio.create_task(
+                run_dspy_sync(intent_query_classifier, cheap_lm=cheap_lm, question=question)
+            )
+            if obviously_research:
+                logger.info("[STREAM] Intent: research (keyword heuristic)")
+            else:
+                intent_task = query_task
+        elif intent_classifier and obviously_research:
+            logger.info("[STREAM] Intent: research (keyword heuristic, classifier skipped)")
+        elif intent_classifier:
             intent_task = asyncio.create_task(
-                _run_dspy_sync(intent_classifier, cheap_lm=cheap_lm, question=question)
+                run_dspy_sync(intent_classifier, cheap_lm=cheap_lm, question=question)
             )
-        if query_generator:
+        if query_generator and query_task is None and not obviously_chitchat:
             query_task = asyncio.create_task(
-                _run_dspy_sync(query_generator, cheap_lm=cheap_lm, user_question=question)
+                run_dspy_sync(query_generator, cheap_lm=cheap_lm, user_question=question)
+            )
+        # Speculative: only used for research questions, cancelled otherwise
+        if acknowledgment_generator and not obviously_chitchat:
+            ack_task = asyncio.create_task(
+                run_dspy_sync(acknowledgment_generator, cheap_lm=cheap_lm, question=question)
             )
 
-        is_research = True
+        is_research = not obviously_chitchat
         pre_generated_query: str | None = None
 
         if intent_task:
             intent_res = await intent_task
             is_research = intent_res.category != "general"
-            logger.info(
-                "[STREAM] Intent: %s (%.2fs)",
-                intent_res.category, time.perf_counter() - t_intent_start
-            )
+            if log_info:
+                logger.info(
+                    "[STREAM] Intent: %s (%dms)",
+                    intent_res.category, (time.perf_counter_ns() - t_intent_start) // 1_000_000
+                )
 
-        yield format_sse(
-            {
-                "type": "status",
-                "step": "classified",
-                "message": (
-                    "Research question detected"
-                    if is_research
-                    else "General question — no paper search needed"
-                ),
-            }
+        yield (
+            _STATUS_CLASSIFIED_RESEARCH_SSE
+            if is_research
+            else _STATUS_CLASSIFIED_GENERAL_SSE
         )
 
+        # Start the first search as soon as the pre-generated query is ready,
+        # so it overlaps with the acknowledgment and planning
+        if is_research and query_task:
+            retrieval_task = asyncio.create_task(_search_pre_generated(query_task, retriever))
+
         # ------------------------------------------------------------------ #
         # 2b. Generate acknowledgment for research questions                 #
         # ------------------------------------------------------------------ #
-        if is_research and acknowledgment_generator:
+        if ack_task and not is_research:
+            ack_task.cancel()
+        elif ack_task:
             try:
-                acknowledgment_result = await _run_dspy_sync(
-                    acknowledgment_generator,
-                    cheap_lm=cheap_lm,
-                    question=question
-                )
+                acknowledgment_result = await ack_task
                 if acknowledgment_result:
                     acknowledgment = getattr(acknowledgment_result, 'acknowledgment', '')
                     if acknowledgment:
@@ -322,37 +632,44 @@ async def stream_dspy_response(
         if not is_research:
             if query_task:
                 query_task.cancel()
-            yield format_sse({"type": "answer_start"})
-
-            streaming_program = dspy.streamify(
-                dspy_program,
-                stream_listeners=[
-                    dspy.streaming.StreamListener(signature_field_name="answer")
-                ],
-            )
-            async for value in streaming_program(
-                question=question,
-                context="No paper context needed for this general query.",
-                history=history,
-            ):
+            yield _ANSWER_START_SSE
+
+            # No papers are involved, so the key is just the question and settings
+            answer_key = None
+            cached_answer = None
+            if not history.messages:
+                answer_key = answer_cache_key(question, language, source_preference, ())
+                cached_answer = await get_cached_answer(answer_key)
+
+            if cached_answer is not None:
+                logger.info("[STREAM] Answer cache hit, skipping general answer LLM call")
+                general_stream = _replay_cached_answer(cached_answer)
+            else:
+                streaming_program = _streamify(dspy_program, "answer")
+                general_stream = _microbatch(streaming_program(
+                    question=question,
+                    context="No paper context needed for this general query.",
+                    history=history,
+                ))
+
+            async for value in general_stream:
                 if isinstance(value, dspy.streaming.StreamResponse) and value.chunk:
-                    token_count += 1
-                    yield format_sse({"type": "token", "content": value.chunk})
+                    token_count += _chunk_count(value)
+                    yield _token_frame(value.chunk)
                 elif isinstance(value, dspy.Prediction):
                     general_answer = getattr(value, "answer", str(value))
-                    yield format_sse({"type": "done", "content": general_answer, "sources": []})
-                    if on_complete:
-                        await on_complete(answer=general_answer, sources=[], search_query=None)
-                    if generate_title:
-                        try:
-                            title = await generate_title(question=question, answer=general_answer)
-                            yield format_sse({"type": "title", "content": title})
-                        except Exception as _te:
-                            logger.warning("[STREAM] Title generation error: %s", _te)
+                    yield _done_frame(general_answer, [], include_final_answer)
+                    if answer_key and cached_answer is None:
+                        await cache_answer(answer_key, general_answer, [])
+                    title = await _finish_completion_tasks(*_start_completion_tasks(
+                        on_complete, generate_title, question, general_answer, [], None
+                    ))
+                    if title is not None:
+                        yield format_sse({"type": "title", "content": title})
 
-            duration_ms = int((time.time() - start_time) * 1000)
+            duration_ms = (time.monotonic_ns() - start_ns) // 1_000_000
             logger.info("[STREAM] General answer completed (%d tokens, %dms)", token_count, duration_ms)
-            yield "data: [DONE]\n\n"
+            yield _DONE_SENTINEL
             return
 
         # ------------------------------------------------------------------ #
@@ -363,21 +680,28 @@ async def stream_dspy_response(
             try:
                 query_result = await query_task
                 pre_generated_query = query_result.search_query
-                logger.info("[STREAM] Pre-generated query: '%s'", pre_generated_query)
+                if log_info:
+                    logger.info("[STREAM] Pre-generated query: '%s'", pre_generated_query)
             except asyncio.CancelledError:
                 pre_generated_query = None
 
-        yield format_sse(
-            {"type": "status", "step": "planning", "message": "Planning approach..."}
-        )
+        if retrieval_task is not None and not pre_generated_query:
+            retrieval_task.cancel()
+            retrieval_task = None
+
+        yield _STATUS_PLANNING_SSE
 
-        t_plan_start = time.perf_counter()
+        t_plan_start = time.perf_counter_ns()
         use_default = _should_use_default_plan(question)
         if planner and not use_default:
-            steps = await asyncio.to_thread(
-                lambda: planner.create_plan(question=question, is_research=is_research, cheap_lm=cheap_lm)
+            steps = await run_dspy_sync(
+                planner.create_plan, cheap_lm=cheap_lm, question=question, is_research=is_research
             )
-            logger.info("[STREAM] Planner LLM call took %.2fs", time.perf_counter() - t_plan_start)
+            if log_info:
+                logger.info(
+                    "[STREAM] Planner LLM call took %dms",
+                    (time.perf_counter_ns() - t_plan_start) // 1_000_000,
+                )
         else:
             steps = default_plan(is_research)
             logger.info("[STREAM] Using default_plan (heuristic skipped planner LLM call)")
@@ -385,31 +709,45 @@ async def stream_dspy_response(
         yield format_sse(
             {
                 "type": "plan",
-                "steps": [s.model_dump() for s in steps],
+                "steps": _STEPS_TA.dump_python(steps, mode="json"),
             }
         )
 
+        # step_start / step_done payloads are fixed once the plan exists
+        step_frames = [
+            (
+                format_sse(
+                    {
+                        "type": "step_start",
+                        "step_id": s.id,
+                        "title": s.title,
+                        "description": s.description,
+                    }
+                ),
+                _STEP_DONE_FMT % s.id,
+            )
+            for s in steps
+        ]
+
         # ------------------------------------------------------------------ #
         # 4. Execute steps                                                     #
         # ------------------------------------------------------------------ #
-        all_papers: list = []
+        # Unique papers across search steps, deduplicated as they arrive;
+        # also the lookup table for citations
+        paper_map: dict = {}
         all_context_parts: list[str] = []
         gathered_context = "No information gathered yet."
+        # Summary lines are appended per search instead of re-rendering every paper
+        gathered_lines = ["Retrieved papers:"]
 
-        for step in steps:
-            t_step_start = time.perf_counter()
-            logger.info(
-                "[STREAM] Step %d/%d: '%s'", step.id + 1, len(steps), step.title
-            )
+        for step, (step_start_sse, step_done_sse) in zip(steps, step_frames):
+            t_step_start = time.perf_counter_ns()
+            if log_info:
+                logger.info(
+                    "[STREAM] Step %d/%d: '%s'", step.id + 1, len(steps), step.title
+                )
 
-            yield format_sse(
-                {
-                    "type": "step_start",
-                    "step_id": step.id,
-                    "title": step.title,
-                    "description": step.description,
-                }
-            )
+            yield step_start_sse
 
             # Search action (if needed)
             if step.needs_search:
@@ -427,9 +765,11 @@ async def stream_dspy_response(
                     step, question, retriever, query_generator, cheap_lm,
                     pre_generated_query=pre_generated_query,
                     query_reformulator=query_reformulator,
+                    prefetched=retrieval_task,
                 )
                 # Only use pre_generated_query for the first search step
                 pre_generated_query = None
+                retrieval_task = None
 
                 # Emit reformulation notice if it happened
                 if original_query is not None:
@@ -443,33 +783,59 @@ async def stream_dspy_response(
                         }
                     )
 
-                all_papers.extend(papers)
+                new_papers = []
+                for p in papers:
+                    if p.id not in paper_map:
+                        paper_map[p.id] = p
+                        new_papers.append(p)
+                gathered_lines.extend(
+                    _paper_summary_lines(new_papers, len(paper_map) - len(new_papers) + 1)
+                )
                 all_context_parts.append(context)
 
-                logger.info(
-                    "[STREAM] Step %d search: query='%s', found %d papers (%.2fs total)",
-                    step.id, search_query, len(papers), time.perf_counter() - t_step_start
-                )
+                if log_info:
+                    logger.info(
+                        "[STREAM] Step %d search: query='%s', found %d papers (%dms total)",
+                        step.id, search_query, len(papers),
+                        (time.perf_counter_ns() - t_step_start) // 1_000_000,
+                    )
 
-                yield format_sse(
-                    {
-                        "type": "step_action",
-                        "step_id": step.id,
-                        "action": "search",
-                        "query": search_query,
-                    }
-                )
-                yield format_sse(
-                    {
-                        "type": "step_action_result",
-                        "step_id": step.id,
-                        "action": "search",
-                        "paper_count": len(papers),
-                    }
+                yield _emit_multi(
+                    format_sse(
+                        {
+                            "type": "step_action",
+                            "step_id": step.id,
+                            "action": "search",
+                            "query": search_query,
+                        }
+                    ),
+                    format_sse(
+                        {
+                            "type": "step_action_result",
+                            "step_id": step.id,
+                            "action": "search",
+                            "paper_count": len(papers),
+                        }
+                    ),
                 )
 
-                # Update gathered context for subsequent steps
-                gathered_context = _paper_summary(all_papers)
+                # Update gathered context for subsequent steps (only step thinking reads it)
+                if planner:
+                    gathered_context = (
+                        "\n".join(gathered_lines) if paper_map else "No papers retrieved yet."
+                    )
+
+            # The final answer only needs the retrieved context, which is complete
+            # once the last step's search is done: start it behind that step's thinking
+            if planner and step is steps[-1]:
+                t_answer_start = time.perf_counter_ns()
+                (
+                    combined_context, answer_key, cached_answer, answer_stream
+                ) = await _start_final_answer(
+                    dspy_program, question, history, paper_map, all_context_parts,
+                    language, source_preference,
+                )
+                answer_stream, answer_prefetch = _prefetch(answer_stream)
 
             # Stream step thinking
             if planner:
@@ -478,62 +844,51 @@ async def stream_dspy_response(
                 ):
                     yield sse_chunk
 
-            yield format_sse({"type": "step_done", "step_id": step.id})
+            yield step_done_sse
 
         # ------------------------------------------------------------------ #
         # 5. Stream final answer                                               #
         # ------------------------------------------------------------------ #
-        yield format_sse({"type": "answer_start"})
-
-        # Deduplicate papers across search steps
-        seen_ids: set = set()
-        unique_papers: list = []
-        for p in all_papers:
-            if p.id not in seen_ids:
-                seen_ids.add(p.id)
-                unique_papers.append(p)
-
-        combined_context = (
-            "\n\n".join(all_context_parts)
-            if all_context_parts
-            else "No paper context available for this general question."
-        )
-
-        streaming_program = dspy.streamify(
-            dspy_program,
-            stream_listeners=[
-                dspy.streaming.StreamListener(signature_field_name="answer")
-            ],
-        )
-
-        t_answer_start = time.perf_counter()
-        logger.info("[STREAM] Generating final answer...")
+        yield _ANSWER_START_SSE
+
+        if answer_stream is None:
+            t_answer_start = time.perf_counter_ns()
+            (
+                combined_context, answer_key, cached_answer, answer_stream
+            ) = await _start_final_answer(
+                dspy_program, question, history, paper_map, all_context_parts,
+                language, source_preference,
+            )
 
-        async for value in streaming_program(
-            question=question, context=combined_context, history=history
-        ):
+        async for value in answer_stream:
             if isinstance(value, dspy.streaming.StreamResponse) and value.chunk:
-                token_count += 1
-                yield format_sse({"type": "token", "content": value.chunk})
+                token_count += _chunk_count(value)
+                yield _token_frame(value.chunk)
 
             elif isinstance(value, dspy.Prediction):
-                cited_papers = _build_cited_papers(
-                    getattr(value, "sources", []), unique_papers
+                cited_papers = build_cited_papers(
+                    getattr(value, "sources", []), paper_map
                 )
                 final_answer = getattr(value, "answer", str(value))
-                final_sources = [p.model_dump() for p in cited_papers]
-                yield format_sse(
-                    {
-                        "type": "done",
-                        "content": final_answer,
-                        "sources": final_sources,
-                    }
+                final_sources = CITED_PAPERS_ADAPTER.dump_python(cited_papers, mode="json")
+                yield _done_frame(final_answer, final_sources, include_final_answer)
+                # Saving history, generating the title and gap detection all run
+                # alongside the audit; the first two are awaited before [DONE]
+                oc_task, title_task = _start_completion_tasks(
+                    on_complete, generate_title, question,
+                    final_answer, final_sources, pre_generated_query,
                 )
-                if on_complete:
-                    await on_complete(
-                        answer=final_answer,
-                        sources=final_sources,
-                        search_query=pre_generated_query,
+                if gap_detector and is_research:
+                    gap_task = asyncio.create_task(
+                        run_dspy_sync(
+                            gap_detector, cheap_lm=cheap_lm,
+                            question=question, answer=final_answer,
+                        )
+                    )
+
+                if answer_key and cached_answer is None:
+                    await cache_answer(
+                        answer_key, final_answer, list(getattr(value, "sources", []))
                     )
 
                 # Citation hallucination audit (pure Python, no LLM call)
@@ -546,66 +901,58 @@ async def stream_dspy_response(
                     )
 
                 # Adaptive gap-filling re-retrieval (only for research questions)
-                if gap_detector and is_research:
+                if gap_task is not None:
                     try:
-                        gap_result = await _run_dspy_sync(
-                            gap_detector, cheap_lm=cheap_lm,
-                            question=question, answer=final_answer,
-                        )
+                        gap_result = await gap_task
                         if (
                             getattr(gap_result, "verdict", "complete") == "partial"
                             and getattr(gap_result, "gap_query", "").strip()
                         ):
                             gap_q = gap_result.gap_query.strip()
                             logger.info("[STREAM] Gap detected. Refining with query: '%s'", gap_q)
+                            # Search while refinement_start is being delivered
+                            retrieval_task = asyncio.create_task(
+                                retriever.get_papers_with_context(gap_q)
+                            )
                             yield format_sse({"type": "refinement_start", "gap_query": gap_q})
 
-                            extra_context, extra_papers = await retriever.get_papers_with_context(gap_q)
+                            extra_context, extra_papers = await retrieval_task
                             yield format_sse({"type": "refinement_search", "paper_count": len(extra_papers)})
 
                             # Merge unique new papers into existing set
-                            new_papers = [p for p in extra_papers if p.id not in seen_ids]
-                            for p in new_papers:
-                                seen_ids.add(p.id)
-                            all_refinement_papers = unique_papers + new_papers
+                            refinement_paper_map = dict(paper_map)
+                            for p in extra_papers:
+                                refinement_paper_map.setdefault(p.id, p)
                             enriched_context = combined_context + ("\n\n" + extra_context if extra_context else "")
 
                             # Re-generate with enriched context, streaming refinement tokens
-                            refinement_program = dspy.streamify(
-                                dspy_program,
-                                stream_listeners=[
-                                    dspy.streaming.StreamListener(signature_field_name="answer")
-                                ],
-                            )
-                            async for rval in refinement_program(
+                            refinement_program = _streamify(dspy_program, "answer")
+                            async for rval in _microbatch(refinement_program(
                                 question=question, context=enriched_context, history=history
-                            ):
+                            )):
                                 if isinstance(rval, dspy.streaming.StreamResponse) and rval.chunk:
-                                    yield format_sse({"type": "refinement_token", "content": rval.chunk})
+                                    yield _token_frame(rval.chunk, _REFINEMENT_TOKEN_PREFIX)
                                 elif isinstance(rval, dspy.Prediction):
-                                    refined_cited = _build_cited_papers(
-                                        getattr(rval, "sources", []), all_refinement_papers
+                                    refined_cited = build_cited_papers(
+                                        getattr(rval, "sources", []), refinement_paper_map
                                     )
                                     yield format_sse({
                                         "type": "refinement_done",
                                         "content": getattr(rval, "answer", ""),
-                                        "sources": [p.model_dump() for p in refined_cited],
+                                        "sources": CITED_PAPERS_ADAPTER.dump_python(refined_cited, mode="json"),
                                     })
                     except Exception as _ge:
                         logger.warning("[STREAM] Gap detection/refinement failed: %s", _ge)
 
-                # Generate and emit title (only when caller requests it)
-                if generate_title:
-                    try:
-                        title = await generate_title(question=question, answer=final_answer)
-                        yield format_sse({"type": "title", "content": title})
-                    except Exception as _te:
-                        logger.warning("[STREAM] Title generation error: %s", _te)
+                # Emit title (only when caller requests it)
+                title = await _finish_completion_tasks(oc_task, title_task)
+                if title is not None:
+                    yield format_sse({"type": "title", "content": title})
 
-        duration_ms = int((time.time() - start_time) * 1000)
+        duration_ms = (time.monotonic_ns() - start_ns) // 1_000_000
         logger.info(
-            "[STREAM] Final answer took %.2fs; Completed (%d tokens, %dms total)",
-            time.perf_counter() - t_answer_start, token_count, duration_ms
+            "[STREAM] Final answer took %dms; Completed (%d tokens, %dms total)",
+            (time.perf_counter_ns() - t_answer_start) // 1_000_000, token_count, duration_ms
         )
 
         if include_metadata:
@@ -613,22 +960,120 @@ async def stream_dspy_response(
                 {"type": "metadata", "token_count": token_count, "duration_ms": duration_ms}
             )
 
-        yield "data: [DONE]\n\n"
+        yield _DONE_SENTINEL
 
     except Exception as e:
-        duration_ms = int((time.time() - start_time) * 1000)
+        duration_ms = (time.monotonic_ns() - start_ns) // 1_000_000
         logger.error(
             "[STREAM] Error after %dms: %s", duration_ms, e, exc_info=True
         )
         yield format_sse({"type": "error", "content": str(e)})
-        yield "data: [DONE]\n\n"
+        yield _DONE_SENTINEL
+    finally:
+        # Work started early but never consumed: the plan had no search step,
+        # or the stream ended on an error or client disconnect
+        pending = [
+            t for t in (
+                intent_task, query_task, ack_task, retrieval_task, answer_prefetch, gap_task
+            )
+            if t is not None and not t.done()
+        ]
+        for t in pending:
+            t.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+# ---------------------------------------------------------------------------
+# Slow-client backpressure
+# ---------------------------------------------------------------------------
+
+# step_thinking chunks are cosmetic and safe to drop when the client lags
+_DROPPABLE_PREFIX = b'data: {"type":"step_thinking"'
+_SLOW_CLIENT_SSE = format_sse({"type": "error", "content": "slow_client"})
+_STREAM_END = object()
+
+
+async def bounded_sse_stream(
+    source: AsyncGenerator[bytes, None],
+    maxsize: int | None = None,
+    put_timeout: float = 5.0,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Buffer SSE frames from `source` in a bounded queue in front of the HTTP writer.
+
+    `maxsize` defaults to Settings.SSE_QUEUE_SIZE. When the queue is full,
+    step_thinking frames are dropped; any other frame waits up to `put_timeout`
+    seconds for room, after which the client is considered too slow: the backlog
+    is discarded, an error event with content "slow_client" is sent and the
+    stream is closed. Closing this generator (e.g. on client disconnect) cancels
+    the producer and waits for `source` to clean up.
+    """
+    if maxsize is None:
+        maxsize = get_settings().SSE_QUEUE_SIZE
+    queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+    dropped = 0
+
+    async def _produce() -> None:
+        nonlocal dropped
+        try:
+            try:
+                async for frame in source:
+                    try:
+                        queue.put_nowait(frame)
+                    except asyncio.QueueFull:
+                        if frame.startswith(_DROPPABLE_PREFIX):
+                            dropped += 1
+                            continue
+                        try:
+                            await asyncio.wait_for(queue.put(frame), put_timeout)
+                        except asyncio.TimeoutError:
+                            raise ClientTooSlow(
+                                f"SSE queue full for {put_timeout}s ({maxsize} frames pending)"
+                            )
+            except ClientTooSlow as e:
+                # Client is not reading: discard the backlog so the error is seen next
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(e)
+                return
+            except Exception as e:
+                # Hand the error to the consumer instead of leaving it waiting
+                await queue.put(e)
+                return
+            await queue.put(_STREAM_END)
+        finally:
+            # A producer cancelled or stopped mid-iteration leaves `source`
+            # suspended at a yield; close it so its own cleanup (cancelling
+            # LM tasks, stopping pumps) runs now rather than at GC time
+            await source.aclose()
+
+    producer = asyncio.create_task(_produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_END:
+                break
+            if isinstance(item, ClientTooSlow):
+                logger.warning("[STREAM] Closing stream: %s", item)
+                yield _SLOW_CLIENT_SSE
+                yield _DONE_SENTINEL
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+        if dropped:
+            logger.info("[STREAM] Dropped %d step_thinking frames for a slow client", dropped)
 
 
 def create_stream_chunk(
     chunk_type: str,
     content: str | None = None,
     sources: list[str] | None = None,
-) -> str:
+) -> bytes:
     data: dict = {"type": chunk_type}
     if content is not None:
         data["content"] = content
@@ -12,31 +12,42 @@ Usage (run from the backend/ directory):
     python db.py reset                !! destructive: downgrade to base then upgrade head
 """
 
-import subprocess
+import os
 import sys
+import traceback
 from pathlib import Path
+from typing import Callable
+
+from alembic import command
+from alembic.config import Config
 
 # Always run Alembic from the backend/ directory so it finds alembic.ini
 ROOT = Path(__file__).parent
 
 
-def _alembic(*args: str) -> int:
-    """Run an alembic sub-command and return the exit code."""
-    cmd = [sys.executable, "-m", "alembic", *args]
-    result = subprocess.run(cmd, cwd=ROOT)
-    return result.returncode
+def _alembic(fn: Callable[..., object], *args, **kwargs) -> int:
+    """
+    Run an alembic command in-process and return an exit code.
+    Avoids starting a new interpreter (and re-importing the app) per command.
+    """
+    try:
+        fn(Config(str(ROOT / "alembic.ini")), *args, **kwargs)
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return 0
 
 
 def cmd_status() -> None:
     print("=== Current revision ===")
-    _alembic("current", "--verbose")
+    _alembic(command.current, verbose=True)
     print("\n=== Pending migrations ===")
-    _alembic("history", "--indicate-current")
+    _alembic(command.history, indicate_current=True)
 
 
 def cmd_push() -> None:
     print("Applying all pending migrations...")
-    code = _alembic("upgrade", "head")
+    code = _alembic(command.upgrade, "head")
     if code == 0:
         print("Done — database is up to date.")
     else:
@@ -51,7 +62,7 @@ def cmd_pull() -> None:
     (e.g. an existing deployment that pre-dates Alembic tracking).
     """
     print("Stamping database as current (no DDL will be executed)...")
-    code = _alembic("stamp", "head")
+    code = _alembic(command.stamp, "head")
     if code == 0:
         print("Done — database marked as up to date.")
     else:
@@ -63,7 +74,7 @@ def cmd_migrate(message: str) -> None:
         print("Error: provide a description, e.g.  python db.py migrate \"add user table\"")
         sys.exit(1)
     print(f'Generating migration: "{message}"')
-    code = _alembic("revision", "--autogenerate", "-m", message)
+    code = _alembic(command.revision, message=message, autogenerate=True)
     if code == 0:
         print("Migration file created in alembic/versions/. Review it before running push.")
     else:
@@ -72,7 +83,7 @@ def cmd_migrate(message: str) -> None:
 
 def cmd_rollback(steps: int = 1) -> None:
     print(f"Rolling back {steps} migration(s)...")
-    code = _alembic("downgrade", f"-{steps}")
+    code = _alembic(command.downgrade, f"-{steps}")
     if code == 0:
         print("Done.")
     else:
@@ -80,7 +91,7 @@ def cmd_rollback(steps: int = 1) -> None:
 
 
 def cmd_history() -> None:
-    _alembic("history", "--verbose")
+    _alembic(command.history, verbose=True)
 
 
 def cmd_reset() -> None:
@@ -92,9 +103,9 @@ def cmd_reset() -> None:
         print("Aborted.")
         return
     print("Downgrading to base...")
-    _alembic("downgrade", "base")
+    _alembic(command.downgrade, "base")
     print("Upgrading to head...")
-    code = _alembic("upgrade", "head")
+    code = _alembic(command.upgrade, "head")
     if code == 0:
         print("Done.")
     else:
@@ -131,17 +142,19 @@ def main() -> None:
         print(HELP)
         return
 
-    command = args[0]
-    if command not in COMMANDS:
-        print(f"Unknown command: {command}\n{HELP}")
+    name = args[0]
+    if name not in COMMANDS:
+        print(f"Unknown command: {name}\n{HELP}")
         sys.exit(1)
 
-    fn = COMMANDS[command]
+    fn = COMMANDS[name]
+    # alembic.ini's script_location and the app's .env are relative to backend/
+    os.chdir(ROOT)
 
-    if command == "migrate":
+    if name == "migrate":
         message = " ".join(args[1:])
         fn(message)
-    elif command == "rollback":
+    elif name == "rollback":
         steps = int(args[1]) if len(args) > 1 else 1
         fn(steps)
     else:
@@ -6,9 +6,12 @@ with the agent, maintaining context across turns.
 """
 
 import requests
-import json
+import uuid
+from requests.adapters import HTTPAdapter
 from typing import List, Dict
 
+from _sse_client import iter_sse_events, loads
+
 BASE_URL = "http://localhost:8000"
 
 
@@ -17,11 +20,15 @@ class ConversationSession:
     
     def __init__(self, session_id: str = None):
         self.session_id = session_id or "demo_session"
+        # Local copy for display only; the server keeps the history per session_id
         self.history: List[Dict] = []
+        # Keep-alive connections are reused across turns instead of reconnecting
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
     
     def chat(self, question: str, stream: bool = False) -> Dict:
         """
-        Send a question with conversation history
+        Send a question; the server loads and saves the history for session_id
         
         Args:
             question: The question to ask
@@ -34,16 +41,18 @@ class ConversationSession:
             "question": question,
             "stream": stream,
             "session_id": self.session_id,
-            "history": self.history
+            # Streamed answers are rebuilt from tokens, so skip the copy in 'done'
+            "meta_params": {"include_final_answer": not stream}
         }
         
         print(f"\n{'='*60}")
         print(f"Q: {question}")
         print(f"{'='*60}")
         
-        response = requests.post(
+        response = self._session.post(
             f"{BASE_URL}/chat/basic",
-            json=payload
+            json=payload,
+            stream=stream
         )
         
         if not stream:
@@ -68,21 +77,14 @@ class ConversationSession:
             answer_parts = []
             sources = []
             
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode('utf-8')
-                    if line.startswith('data: '):
-                        data_str = line[6:]
-                        if data_str == '[DONE]':
-                            break
-                        
-                        data = json.loads(data_str)
-                        if data.get("type") == "token":
-                            content = data["content"]
-                            print(content, end="", flush=True)
-                            answer_parts.append(content)
-                        elif data.get("type") == "done":
-                            sources = data.get("sources", [])
+            for payload in iter_sse_events(response):
+                data = loads(payload)
+                if data.get("type") == "token":
+                    content = data["content"]
+                    print(content, end="", flush=True)
+                    answer_parts.append(content)
+                elif data.get("type") == "done":
+                    sources = data.get("sources", [])
             
             print()  # New line after streaming
             if sources:
@@ -99,8 +101,9 @@ class ConversationSession:
             return {"answer": full_answer, "sources": sources}
     
     def clear_history(self):
-        """Clear conversation history"""
+        """Clear conversation history by starting a new server-side session"""
         self.history = []
+        self.session_id = f"{self.session_id.split(':')[0]}:{uuid.uuid4().hex[:8]}"
         print("\n🗑️  History cleared")
     
     def show_history(self):
@@ -231,7 +234,7 @@ if __name__ == "__main__":
     
     try:
         # Check if server is running
-        response = requests.get(f"{BASE_URL}/health", timeout=2)
+        response = requests.head(f"{BASE_URL}/health", timeout=2)
         if response.status_code == 200:
             print("✅ Server is running\n")
         else:
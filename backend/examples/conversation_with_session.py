@@ -5,20 +5,43 @@ This script demonstrates how to use the new meta_params API structure
 with Redis-based session management for conversation history.
 """
 
+import asyncio
+import httpx
 import requests
 import json
 import uuid
+from requests.adapters import HTTPAdapter
 from typing import Optional
 
+from _sse_client import HTTP2, TokenPrinter, dumps, iter_sse_events, loads, run_concurrently
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
 BASE_URL = "http://localhost:8000"
 
 
+def make_session() -> requests.Session:
+    """Session with a keep-alive connection pool, reused across requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by the one-off requests outside ConversationClient
+SESSION = make_session()
+
+
 class ConversationClient:
     """Client for managing conversations with the OpenTA Agent"""
     
     def __init__(self, base_url: str = BASE_URL):
         self.base_url = base_url
         self.conversation_id: Optional[str] = None
+        self._session = make_session()
+        # meta_params fields that never change between turns
+        self._meta_template = {"timezone": "Asia/Jakarta", "attachments": []}
     
     def start_conversation(self, conversation_id: Optional[str] = None):
         """Start a new conversation or continue existing one."""
@@ -49,14 +72,13 @@ class ConversationClient:
         payload = {
             "query": query,
             "meta_params": {
+                **self._meta_template,
                 "mode": mode,
                 "stream": stream,
                 "language": language,
                 "source_preference": source_preference,
                 "is_incognito": is_incognito,
                 "conversation_id": self.conversation_id if not is_incognito else None,
-                "timezone": "Asia/Jakarta",
-                "attachments": []
             }
         }
         
@@ -74,9 +96,10 @@ class ConversationClient:
     
     def _chat_non_streaming(self, payload: dict):
         """Handle non-streaming response."""
-        response = requests.post(
+        response = self._session.post(
             f"{self.base_url}/chat/basic",
-            json=payload
+            data=dumps(payload),
+            headers=_JSON_HEADERS
         )
         
         result = response.json()
@@ -92,9 +115,10 @@ class ConversationClient:
     
     def _chat_streaming(self, payload: dict):
         """Handle streaming response."""
-        response = requests.post(
+        response = self._session.post(
             f"{self.base_url}/chat/basic",
-            json=payload,
+            data=dumps(payload),
+            headers=_JSON_HEADERS,
             stream=True
         )
         
@@ -102,24 +126,19 @@ class ConversationClient:
         answer_parts = []
         sources = []
         
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    data_str = line[6:]
-                    if data_str == '[DONE]':
-                        break
-                    
-                    try:
-                        data = json.loads(data_str)
-                        if data.get("type") == "token":
-                            content = data["content"]
-                            print(content, end="", flush=True)
-                            answer_parts.append(content)
-                        elif data.get("type") == "done":
-                            sources = data.get("sources", [])
-                    except json.JSONDecodeError:
-                        pass
+        printer = TokenPrinter()
+        for payload in iter_sse_events(response):
+            try:
+                data = loads(payload)
+                if data.get("type") == "token":
+                    content = data["content"]
+                    printer.write(content)
+                    answer_parts.append(content)
+                elif data.get("type") == "done":
+                    sources = data.get("sources", [])
+            except json.JSONDecodeError:
+                pass
+        printer.flush()
         
         print()  # New line
         if sources:
@@ -135,6 +154,10 @@ class ConversationClient:
         print(f"\n✅ Conversation {self.conversation_id} ended")
         self.conversation_id = None
 
+    def close(self):
+        """Close pooled connections once the client is no longer needed."""
+        self._session.close()
+
 
 def demo_basic_conversation():
     """Demo 1: Basic conversation with session management"""
@@ -164,6 +187,7 @@ def demo_basic_conversation():
     )
     
     client.end_conversation()
+    client.close()
 
 
 def demo_multilingual():
@@ -189,6 +213,20 @@ def demo_multilingual():
     )
     
     client.end_conversation()
+    client.close()
+
+
+async def _post_concurrently(payloads: list) -> list:
+    """POST independent chat requests at once and return their JSON bodies."""
+    async with httpx.AsyncClient(
+        http2=HTTP2,
+        limits=httpx.Limits(max_keepalive_connections=8),
+        timeout=httpx.Timeout(120.0),
+    ) as client:
+        responses = await asyncio.gather(
+            *(client.post(f"{BASE_URL}/chat/basic", json=payload) for payload in payloads)
+        )
+    return [response.json() for response in responses]
 
 
 def demo_source_preferences():
@@ -197,27 +235,29 @@ def demo_source_preferences():
     print("DEMO 3: Source Preferences")
     print("="*70)
     
-    client = ConversationClient()
-    
-    # Only papers
-    client.start_conversation()
-    print("\n📚 Source: Only Papers")
-    client.chat(
-        "What is deep learning?",
-        stream=False,
-        source_preference="only_papers"
-    )
-    client.end_conversation()
+    # The two conversations are independent, so both requests run at once
+    preferences = [
+        ("📚 Source: Only Papers", "only_papers"),
+        ("🌐 Source: All Sources", "all"),
+    ]
+    payloads = [
+        {
+            "query": "What is deep learning?",
+            "meta_params": {
+                "stream": False,
+                "source_preference": source_preference,
+                "conversation_id": str(uuid.uuid4()),
+            }
+        }
+        for _, source_preference in preferences
+    ]
+    results = asyncio.run(_post_concurrently(payloads))
     
-    # All sources
-    client.start_conversation()
-    print("\n🌐 Source: All Sources")
-    client.chat(
-        "What is deep learning?",
-        stream=False,
-        source_preference="all"
-    )
-    client.end_conversation()
+    for (label, _), result in zip(preferences, results):
+        print(f"\n{label}")
+        print(f"🤖 Agent: {result['answer']}")
+        if result.get('search_query'):
+            print(f"🔍 Search Query: {result['search_query']}")
 
 
 def demo_incognito_mode():
@@ -240,6 +280,7 @@ def demo_incognito_mode():
         stream=False,
         is_incognito=True
     )
+    client.close()
 
 
 def demo_streaming():
@@ -257,6 +298,7 @@ def demo_streaming():
     )
     
     client.end_conversation()
+    client.close()
 
 
 def demo_session_continuation():
@@ -286,6 +328,7 @@ def demo_session_continuation():
     )
     
     client.end_conversation()
+    client.close()
 
 
 def demo_api_compatibility():
@@ -303,7 +346,7 @@ def demo_api_compatibility():
     print("📤 Using old API format:")
     print(json.dumps(old_payload, indent=2))
     
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/chat/basic",
         json=old_payload
     )
@@ -357,6 +400,7 @@ def interactive_mode():
             print(f"❌ Error: {e}")
     
     client.end_conversation()
+    client.close()
 
 
 if __name__ == "__main__":
@@ -371,7 +415,7 @@ if __name__ == "__main__":
     
     # Check server
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=2)
+        response = SESSION.head(f"{BASE_URL}/health", timeout=2)
         if response.status_code == 200:
             print("✅ Server is running\n")
         else:
@@ -405,8 +449,7 @@ if __name__ == "__main__":
         print("Goodbye!")
         exit(0)
     elif choice == 'all':
-        for key in ["1", "2", "3", "4", "5", "6", "7"]:
-            demos[key][1]()
+        run_concurrently([demos[key] for key in ["1", "2", "3", "4", "5", "6", "7"]])
     elif choice in demos:
         demos[choice][1]()
     else:
@@ -5,13 +5,29 @@ This script tests the streaming functionality to ensure it follows
 DSPy best practices and works correctly with SSE.
 """
 
+import asyncio
+import httpx
 import requests
 import json
 import time
-from typing import Generator
+from requests.adapters import HTTPAdapter
+
+from _sse_client import (
+    HTTP2,
+    TokenPrinter,
+    aiter_sse_events,
+    iter_sse_events,
+    loads,
+    run_concurrently,
+)
 
 BASE_URL = "http://localhost:8000"
 
+# One keep-alive connection pool shared by every test request
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+
 
 def test_streaming_basic():
     """Test 1: Basic streaming with token-by-token output"""
@@ -32,55 +48,51 @@ def test_streaming_basic():
     print("Assistant: ", end="", flush=True)
     
     start_time = time.time()
-    token_count = 0
+    # Token events carry server-side microbatches of LM chunks, not single tokens
+    event_count = 0
     
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/chat/basic",
         json=payload,
         stream=True
     )
     
-    for line in response.iter_lines():
-        if line:
-            line = line.decode('utf-8')
-            if line.startswith('data: '):
-                data_str = line[6:]
-                if data_str == '[DONE]':
-                    break
-                
-                try:
-                    data = json.loads(data_str)
-                    
-                    if data.get("type") == "start":
-                        print(f"\n[Stream started at {data.get('timestamp')}]")
-                        print("Assistant: ", end="", flush=True)
-                    
-                    elif data.get("type") == "token":
-                        print(data["content"], end="", flush=True)
-                        token_count += 1
-                    
-                    elif data.get("type") == "rationale":
-                        print(f"\n\n💭 Reasoning: {data['content']}\n")
-                        print("Assistant: ", end="", flush=True)
-                    
-                    elif data.get("type") == "done":
-                        print("\n")
-                        if data.get("sources"):
-                            print(f"📄 Sources: {', '.join(data['sources'])}")
-                    
-                    elif data.get("type") == "metadata":
-                        print(f"\n📊 Metadata:")
-                        print(f"   - Tokens: {data.get('token_count')}")
-                        print(f"   - Duration: {data.get('duration_ms')}ms")
-                    
-                    elif data.get("type") == "error":
-                        print(f"\n❌ Error: {data['content']}")
-                
-                except json.JSONDecodeError:
-                    pass
+    printer = TokenPrinter()
+    for payload in iter_sse_events(response):
+        try:
+            data = loads(payload)
+            
+            if data.get("type") == "start":
+                print(f"\n[Stream started at {data.get('timestamp')}]")
+                print("Assistant: ", end="", flush=True)
+            
+            elif data.get("type") == "token":
+                printer.write(data["content"])
+                event_count += 1
+            
+            elif data.get("type") == "rationale":
+                print(f"\n\n💭 Reasoning: {data['content']}\n")
+                print("Assistant: ", end="", flush=True)
+            
+            elif data.get("type") == "done":
+                print("\n")
+                if data.get("sources"):
+                    print(f"📄 Sources: {', '.join(data['sources'])}")
+            
+            elif data.get("type") == "metadata":
+                print("\n📊 Metadata:")
+                print(f"   - Tokens: {data.get('token_count')}")
+                print(f"   - Duration: {data.get('duration_ms')}ms")
+            
+            elif data.get("type") == "error":
+                print(f"\n❌ Error: {data['content']}")
+        
+        except json.JSONDecodeError:
+            pass
+    printer.flush()
     
     duration = time.time() - start_time
-    print(f"\n✅ Test completed in {duration:.2f}s ({token_count} tokens)")
+    print(f"\n✅ Test completed in {duration:.2f}s ({event_count} token events)")
 
 
 def test_streaming_vs_non_streaming():
@@ -94,7 +106,7 @@ def test_streaming_vs_non_streaming():
     # Test non-streaming
     print("\n🔹 Non-Streaming Request:")
     start = time.time()
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/chat/basic",
         json={
             "query": query,
@@ -109,7 +121,7 @@ def test_streaming_vs_non_streaming():
     # Test streaming
     print("\n🔹 Streaming Request:")
     start = time.time()
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/chat/basic",
         json={
             "query": query,
@@ -121,22 +133,15 @@ def test_streaming_vs_non_streaming():
     first_token_time = None
     answer_parts = []
     
-    for line in response.iter_lines():
-        if line:
-            line = line.decode('utf-8')
-            if line.startswith('data: '):
-                data_str = line[6:]
-                if data_str == '[DONE]':
-                    break
-                
-                try:
-                    data = json.loads(data_str)
-                    if data.get("type") == "token":
-                        if first_token_time is None:
-                            first_token_time = time.time() - start
-                        answer_parts.append(data["content"])
-                except json.JSONDecodeError:
-                    pass
+    for payload in iter_sse_events(response):
+        try:
+            data = loads(payload)
+            if data.get("type") == "token":
+                if first_token_time is None:
+                    first_token_time = time.time() - start
+                answer_parts.append(data["content"])
+        except json.JSONDecodeError:
+            pass
     
     stream_duration = time.time() - start
     full_answer = "".join(answer_parts)
@@ -145,7 +150,7 @@ def test_streaming_vs_non_streaming():
     print(f"   Total time: {stream_duration:.2f}s")
     print(f"   Answer length: {len(full_answer)} chars")
     
-    print(f"\n📊 Analysis:")
+    print("\n📊 Analysis:")
     print(f"   - First token latency: {first_token_time:.2f}s (streaming advantage!)")
     print(f"   - Total time difference: {abs(stream_duration - non_stream_duration):.2f}s")
 
@@ -161,7 +166,7 @@ def test_streaming_with_history():
     
     # First message (non-streaming to build history)
     print("\n🔹 Turn 1 (Building history):")
-    response1 = requests.post(
+    response1 = SESSION.post(
         f"{BASE_URL}/chat/basic",
         json={
             "query": "What is neural network?",
@@ -179,7 +184,7 @@ def test_streaming_with_history():
     print("   Query: 'How does it learn?'")
     print("   Assistant: ", end="", flush=True)
     
-    response2 = requests.post(
+    response2 = SESSION.post(
         f"{BASE_URL}/chat/basic",
         json={
             "query": "How does it learn?",
@@ -191,24 +196,19 @@ def test_streaming_with_history():
         stream=True
     )
     
-    for line in response2.iter_lines():
-        if line:
-            line = line.decode('utf-8')
-            if line.startswith('data: '):
-                data_str = line[6:]
-                if data_str == '[DONE]':
-                    break
-                
-                try:
-                    data = json.loads(data_str)
-                    if data.get("type") == "token":
-                        print(data["content"], end="", flush=True)
-                    elif data.get("type") == "done":
-                        print("\n")
-                        if data.get("sources"):
-                            print(f"   📄 Sources: {', '.join(data['sources'])}")
-                except json.JSONDecodeError:
-                    pass
+    printer = TokenPrinter()
+    for payload in iter_sse_events(response2):
+        try:
+            data = loads(payload)
+            if data.get("type") == "token":
+                printer.write(data["content"])
+            elif data.get("type") == "done":
+                print("\n")
+                if data.get("sources"):
+                    print(f"   📄 Sources: {', '.join(data['sources'])}")
+        except json.JSONDecodeError:
+            pass
+    printer.flush()
     
     print("\n✅ Conversation history maintained across turns!")
 
@@ -223,7 +223,7 @@ def test_streaming_error_handling():
     print("\n🔹 Testing error handling (empty query):")
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/chat/basic",
             json={
                 "query": "",  # Empty query
@@ -233,20 +233,13 @@ def test_streaming_error_handling():
             timeout=5
         )
         
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    data_str = line[6:]
-                    if data_str == '[DONE]':
-                        break
-                    
-                    try:
-                        data = json.loads(data_str)
-                        if data.get("type") == "error":
-                            print(f"   ✅ Error properly caught: {data['content']}")
-                    except json.JSONDecodeError:
-                        pass
+        for payload in iter_sse_events(response):
+            try:
+                data = loads(payload)
+                if data.get("type") == "error":
+                    print(f"   ✅ Error properly caught: {data['content']}")
+            except json.JSONDecodeError:
+                pass
     except Exception as e:
         print(f"   ✅ Request validation caught error: {e}")
 
@@ -267,7 +260,7 @@ def test_streaming_languages():
         print(f"   Query: {query}")
         print("   Assistant: ", end="", flush=True)
         
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/chat/basic",
             json={
                 "query": query,
@@ -280,26 +273,62 @@ def test_streaming_languages():
         )
         
         word_count = 0
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    data_str = line[6:]
-                    if data_str == '[DONE]':
-                        break
-                    
-                    try:
-                        data = json.loads(data_str)
-                        if data.get("type") == "token":
-                            print(data["content"], end="", flush=True)
-                            if data["content"].strip():
-                                word_count += len(data["content"].split())
-                    except json.JSONDecodeError:
-                        pass
+        printer = TokenPrinter()
+        for payload in iter_sse_events(response):
+            try:
+                data = loads(payload)
+                if data.get("type") == "token":
+                    printer.write(data["content"])
+                    if data["content"].strip():
+                        word_count += len(data["content"].split())
+            except json.JSONDecodeError:
+                pass
+        printer.flush()
         
         print(f" ({word_count} words)\n")
 
 
+async def _stream_one(client: httpx.AsyncClient, query: str) -> dict:
+    """Stream one query and return its first-token time, total time and token event count."""
+    start = time.time()
+    first_token = None
+    event_count = 0
+    
+    async with client.stream(
+        "POST",
+        f"{BASE_URL}/chat/basic",
+        json={
+            "query": query,
+            "meta_params": {"stream": True}
+        },
+    ) as response:
+        async for payload in aiter_sse_events(response):
+            try:
+                data = loads(payload)
+                if data.get("type") == "token":
+                    if first_token is None:
+                        first_token = time.time() - start
+                    event_count += 1
+            except json.JSONDecodeError:
+                pass
+    
+    return {
+        "first_token": first_token,
+        "total_time": time.time() - start,
+        "event_count": event_count,
+    }
+
+
+async def _stream_all(queries: list) -> list:
+    """Stream independent queries concurrently over one connection pool."""
+    async with httpx.AsyncClient(
+        http2=HTTP2,
+        limits=httpx.Limits(max_keepalive_connections=8),
+        timeout=httpx.Timeout(120.0),
+    ) as client:
+        return await asyncio.gather(*(_stream_one(client, query) for query in queries))
+
+
 def test_stream_performance():
     """Test 6: Performance metrics"""
     print("\n" + "="*70)
@@ -312,47 +341,24 @@ def test_stream_performance():
         "What are neural networks?"
     ]
     
-    print("\n📊 Testing streaming performance...\n")
+    print("\n📊 Testing streaming performance (queries run concurrently)...\n")
+    
+    wall_start = time.time()
+    results = asyncio.run(_stream_all(queries))
+    wall_time = time.time() - wall_start
     
-    for i, query in enumerate(queries, 1):
+    for i, (query, result) in enumerate(zip(queries, results), 1):
         print(f"Query {i}: {query}")
         
-        start = time.time()
-        first_token = None
-        token_count = 0
+        total_time = result["total_time"]
+        event_count = result["event_count"]
         
-        response = requests.post(
-            f"{BASE_URL}/chat/basic",
-            json={
-                "query": query,
-                "meta_params": {"stream": True}
-            },
-            stream=True
-        )
-        
-        for line in response.iter_lines():
-            if line:
-                line = line.decode('utf-8')
-                if line.startswith('data: '):
-                    data_str = line[6:]
-                    if data_str == '[DONE]':
-                        break
-                    
-                    try:
-                        data = json.loads(data_str)
-                        if data.get("type") == "token":
-                            if first_token is None:
-                                first_token = time.time() - start
-                            token_count += 1
-                    except json.JSONDecodeError:
-                        pass
-        
-        total_time = time.time() - start
-        
-        print(f"  • First token: {first_token:.2f}s")
+        print(f"  • First token: {result['first_token']:.2f}s")
         print(f"  • Total time: {total_time:.2f}s")
-        print(f"  • Tokens: {token_count}")
-        print(f"  • Avg latency: {(total_time/token_count if token_count > 0 else 0):.3f}s/token\n")
+        print(f"  • Token events: {event_count}")
+        print(f"  • Avg interval: {(total_time/event_count if event_count > 0 else 0):.3f}s/event\n")
+    
+    print(f"  • Wall time for all queries: {wall_time:.2f}s\n")
 
 
 def run_all_tests():
@@ -367,7 +373,7 @@ def run_all_tests():
     
     # Check server
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=2)
+        response = SESSION.head(f"{BASE_URL}/health", timeout=2)
         if response.status_code == 200:
             print("✅ Server is running\n")
         else:
@@ -398,8 +404,7 @@ def run_all_tests():
         print("Goodbye!")
         return
     elif choice == 'all':
-        for name, test_func in tests:
-            test_func()
+        run_concurrently(tests)
     elif choice.isdigit() and 1 <= int(choice) <= len(tests):
         tests[int(choice)-1][1]()
     else:
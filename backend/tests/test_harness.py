@@ -1,5 +1,5 @@
 import pytest
-from app.utils.streaming import _audit_citations
+from app.utils.streaming import _audit_citations, build_cited_papers
 from app.core.models import CitedPaper
 
 def test_audit_clean_citations():
@@ -49,3 +49,12 @@ def test_audit_no_papers_hallucinated():
     result = _audit_citations(answer, papers)
     assert result["is_clean"] is False
     assert result["hallucinated_citation_numbers"] == [1]
+
+def test_cited_papers_numbered_after_dedup():
+    class Paper:
+        def __init__(self, pid):
+            self.id, self.title, self.authors, self.abstract, self.year = pid, "T", [], "A", 2020
+
+    paper_map = {pid: Paper(pid) for pid in ("p1", "p2")}
+    cited = build_cited_papers(["p1", "p1", "p2"], paper_map)
+    assert [(p.id, p.citation_number) for p in cited] == [("p1", 1), ("p2", 2)]
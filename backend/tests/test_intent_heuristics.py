@@ -0,0 +1,35 @@
+import pytest
+from app.services.intent_heuristics import is_obviously_chitchat, is_obviously_research
+
+
+@pytest.mark.parametrize("question", [
+    "hi",
+    "Hello!",
+    "hey there",
+    "  Thanks!! ",
+    "thank you",
+    "Terima kasih kak",
+    "good morning everyone",
+    "Selamat pagi",
+    "halo semua :)",
+])
+def test_bare_greetings_are_chitchat(question):
+    assert is_obviously_chitchat(question)
+
+
+@pytest.mark.parametrize("question", [
+    "hi, what papers cover transformers?",
+    "hello world program in python",
+    "thanks for the papers on RAG, any more?",
+    "highlight the main findings",
+    "they said thank you to the reviewers",
+    "",
+])
+def test_questions_with_content_are_not_chitchat(question):
+    assert not is_obviously_chitchat(question)
+
+
+def test_research_markers_ignore_punctuation_and_case():
+    assert is_obviously_research("Any PAPERS on federated learning?")
+    assert is_obviously_research("who are the authors: of this")
+    assert not is_obviously_research("what is machine learning?")
@@ -0,0 +1,29 @@
+import asyncio
+
+from app.utils import redis_client
+
+
+def test_failed_connect_is_not_retried_until_backoff_expires(monkeypatch):
+    attempts = []
+
+    async def unreachable(*args, **kwargs):
+        attempts.append(kwargs)
+        raise ConnectionError("refused")
+
+    from redis import asyncio as aioredis
+    monkeypatch.setattr(aioredis, "from_url", unreachable)
+    monkeypatch.setattr(redis_client, "_redis", None)
+    monkeypatch.setattr(redis_client, "_retry_at", 0.0)
+    monkeypatch.setattr(redis_client, "_lock", None)
+
+    async def run():
+        return [await redis_client.get_redis() for _ in range(3)]
+
+    assert asyncio.run(run()) == [None, None, None]
+    assert len(attempts) == 1
+    assert attempts[0]["socket_connect_timeout"] == redis_client.CONNECT_TIMEOUT
+
+    monkeypatch.setattr(redis_client, "_retry_at", 0.0)
+    monkeypatch.setattr(redis_client, "_lock", None)
+    assert asyncio.run(redis_client.get_redis()) is None
+    assert len(attempts) == 2
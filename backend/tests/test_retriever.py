@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+import pytest
+from app.db.crud import _keyword_terms
+from app.services.retriever import _RRF_K, _rrf_fuse
+
+
+def _cat(catalog_id):
+    return SimpleNamespace(id=catalog_id)
+
+
+def test_rrf_fuse_scores_are_rrf_values():
+    primary = [(_cat(1), 0.91), (_cat(2), 0.85)]
+    secondary = [(_cat(3), 7.5)]
+    fused = _rrf_fuse(primary, secondary, limit=10)
+    scores = {c.id: s for c, s in fused}
+    assert scores[1] == pytest.approx(1 / (_RRF_K + 1))
+    assert scores[3] == pytest.approx(1 / (_RRF_K + 1))
+    assert scores[2] == pytest.approx(1 / (_RRF_K + 2))
+    # Keyword scores (up to 7.5) never leak into the fused output
+    assert all(s < 1 for _, s in fused)
+
+
+def test_rrf_fuse_rewards_agreement():
+    primary = [(_cat(1), 0.9), (_cat(2), 0.8), (_cat(3), 0.7)]
+    secondary = [(_cat(3), 5.0), (_cat(4), 3.0)]
+    fused = _rrf_fuse(primary, secondary, limit=10)
+    assert fused[0][0].id == 3
+    assert fused[0][1] == pytest.approx(1 / (_RRF_K + 3) + 1 / (_RRF_K + 1))
+    assert [c.id for c, _ in fused][:2] == [3, 1]
+
+
+def test_rrf_fuse_respects_limit_and_empty_inputs():
+    primary = [(_cat(i), 1.0) for i in range(10)]
+    assert [c.id for c, _ in _rrf_fuse(primary, [], limit=3)] == [0, 1, 2]
+    assert _rrf_fuse([], [], limit=5) == []
+
+
+def test_keyword_terms_splits_and_filters():
+    assert _keyword_terms("Deep learning for deep PDF_parsing, 5G?") == [
+        "deep", "learning", "for", "pdf", "parsing"
+    ]
+    assert _keyword_terms("a % _ of") == []
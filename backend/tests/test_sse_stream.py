@@ -0,0 +1,167 @@
+import asyncio
+
+import dspy
+import pytest
+from app.utils.streaming import (
+    _DONE_SENTINEL,
+    _SLOW_CLIENT_SSE,
+    _chunk_count,
+    _microbatch,
+    _prefetch,
+    _replay_cached_answer,
+    bounded_sse_stream,
+)
+
+
+def _frame(i):
+    return f'data: {{"type":"token","content":"{i}"}}\n\n'.encode()
+
+
+def _tracked_source(state, count=100):
+    async def source():
+        try:
+            for i in range(count):
+                yield _frame(i)
+        finally:
+            state["closed"] = True
+    return source()
+
+
+def test_bounded_stream_passes_frames_through():
+    async def run():
+        state = {}
+        frames = [f async for f in bounded_sse_stream(_tracked_source(state, 5), maxsize=2)]
+        return frames, state
+
+    frames, state = asyncio.run(run())
+    assert frames == [_frame(i) for i in range(5)]
+    assert state["closed"] is True
+
+
+def test_bounded_stream_aclose_closes_blocked_source():
+    async def run():
+        state = {}
+        # Keep a reference so only an explicit aclose, not GC, can close it
+        source = _tracked_source(state)
+        stream = bounded_sse_stream(source, maxsize=2, put_timeout=30)
+        assert await stream.__anext__() == _frame(0)
+        # Let the producer fill the queue and block on put
+        await asyncio.sleep(0.05)
+        assert "closed" not in state
+        await stream.aclose()
+        return state.get("closed")
+
+    assert asyncio.run(run()) is True
+
+
+def test_bounded_stream_slow_client_closes_source():
+    async def run():
+        state = {}
+        source = _tracked_source(state)
+        stream = bounded_sse_stream(source, maxsize=2, put_timeout=0.05)
+        first = await stream.__anext__()
+        # Stop reading long enough for the producer's put to time out
+        await asyncio.sleep(0.2)
+        rest = [f async for f in stream]
+        return first, rest, state.get("closed")
+
+    first, rest, closed = asyncio.run(run())
+    assert first == _frame(0)
+    assert rest == [_SLOW_CLIENT_SSE, _DONE_SENTINEL]
+    assert closed is True
+
+
+def _chunk(text):
+    return dspy.streaming.StreamResponse("p", "answer", text, False)
+
+
+async def _chunks(texts, delay=0.0, tail=None, error=None):
+    for text in texts:
+        if delay:
+            await asyncio.sleep(delay)
+        yield _chunk(text)
+    if tail is not None:
+        yield tail
+    if error is not None:
+        raise error
+
+
+def _collect(stream):
+    async def run():
+        return [v async for v in stream()]
+    return asyncio.run(run())
+
+
+def test_microbatch_flushes_on_chunk_count():
+    out = _collect(lambda: _microbatch(_chunks("abcde"), max_chunks=2, max_delay_ms=1000))
+    assert [v.chunk for v in out] == ["ab", "cd", "e"]
+    assert [_chunk_count(v) for v in out] == [2, 2, 1]
+
+
+def test_microbatch_flushes_on_size():
+    out = _collect(lambda: _microbatch(
+        _chunks(["xxx", "yyy", "z"]), max_chunks=100, max_delay_ms=1000, max_chars=5
+    ))
+    assert [v.chunk for v in out] == ["xxxyyy", "z"]
+    assert sum(_chunk_count(v) for v in out) == 3
+
+
+def test_microbatch_flushes_on_deadline():
+    out = _collect(lambda: _microbatch(
+        _chunks("abc", delay=0.05), max_chunks=100, max_delay_ms=10
+    ))
+    assert [v.chunk for v in out] == ["a", "b", "c"]
+
+
+def test_microbatch_passes_prediction_through_after_flush():
+    pred = dspy.Prediction(answer="abc")
+    out = _collect(lambda: _microbatch(_chunks("abc", tail=pred), max_chunks=100, max_delay_ms=1000))
+    assert [v.chunk for v in out[:-1]] == ["abc"]
+    assert out[-1] is pred
+
+
+def test_microbatch_propagates_stream_error():
+    with pytest.raises(ValueError):
+        _collect(lambda: _microbatch(_chunks("ab", error=ValueError("boom"))))
+
+
+def test_chunk_count_of_plain_response_is_one():
+    assert _chunk_count(_chunk("a")) == 1
+
+
+def test_prefetch_consumes_before_iteration():
+    async def run():
+        seen = []
+
+        async def source():
+            for i in range(3):
+                seen.append(i)
+                yield i
+
+        replay, pump = _prefetch(source())
+        await asyncio.sleep(0.01)
+        consumed_early = list(seen)
+        return consumed_early, [v async for v in replay], pump.done()
+
+    consumed_early, values, pump_done = asyncio.run(run())
+    assert consumed_early == [0, 1, 2]
+    assert values == [0, 1, 2]
+    assert pump_done
+
+
+def test_prefetch_propagates_stream_error():
+    async def run():
+        replay, _ = _prefetch(_chunks("a", error=ValueError("boom")))
+        return [v async for v in replay]
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+
+def test_replay_cached_answer_sends_one_chunk():
+    cached = {"answer": " ".join(["word"] * 500), "sources": ["p1"]}
+    out = _collect(lambda: _replay_cached_answer(cached))
+    assert len(out) == 2
+    assert out[0].chunk == cached["answer"]
+    assert out[1].answer == cached["answer"]
+    assert out[1].sources == ["p1"]
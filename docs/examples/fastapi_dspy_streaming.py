@@ -9,6 +9,7 @@ from pydantic import BaseModel
 from typing import List, Optional, Literal
 import dspy
 import orjson
+from litellm.types.utils import ModelResponseStream
 import os
 
 # =============================================================================
@@ -74,9 +75,12 @@ class QAWithReasoning(dspy.Signature):
 # STREAMING UTILITIES
 # =============================================================================
 
-def format_sse(data: dict) -> str:
-    """Format dictionary as Server-Sent Event"""
-    return f"data: {orjson.dumps(data).decode()}\n\n"
+def format_sse(data: dict) -> bytes:
+    """Format dictionary as Server-Sent Event (bytes, so Starlette skips re-encoding)"""
+    return b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+DONE_SSE = b"data: [DONE]\n\n"
 
 
 async def stream_dspy_prediction(dspy_module, **kwargs) -> StreamingResponse:
@@ -99,17 +103,18 @@ async def stream_dspy_prediction(dspy_module, **kwargs) -> StreamingResponse:
                     "reasoning": getattr(value, 'reasoning', None)
                 }
                 yield format_sse(data)
-            elif hasattr(value, 'choices'):
-                # Streaming chunk from LM
-                if value.choices and hasattr(value.choices[0], 'delta'):
-                    delta = value.choices[0].delta
-                    content = getattr(delta, 'content', None)
-                    if content:
-                        data = {"type": "token", "content": content}
-                        yield format_sse(data)
+            elif isinstance(value, ModelResponseStream):
+                # Streaming chunk from LM; one type check instead of per-token hasattr probes
+                try:
+                    content = value.choices[0].delta.content
+                except (IndexError, AttributeError):
+                    continue
+                if content:
+                    data = {"type": "token", "content": content}
+                    yield format_sse(data)
         
         # Send completion signal
-        yield "data: [DONE]\n\n"
+        yield DONE_SSE
     
     return StreamingResponse(
         generate(),
@@ -201,7 +206,7 @@ async def test_streaming():
             yield format_sse(data)
         
         yield format_sse({"type": "done", "content": " ".join(words)})
-        yield "data: [DONE]\n\n"
+        yield DONE_SSE
     
     return StreamingResponse(
         generate(),